@@ -0,0 +1,63 @@
+"""Compare the polars and duckdb engines of PlexosSolution.query on a solution zip file.
+
+    python benchmarks/query_engines.py "Model PCP Solution.zip" --repeat 5
+
+Every query shape is timed with both engines, bypassing the query cache, and the median is
+printed with the faster engine of each shape.
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.schema import QuerySchema
+
+SHAPES = {
+    "node price": [QuerySchema.NODE.PRICE],
+    "generator generation": [QuerySchema.GENERATOR.GENERATION],
+    "line flow": [QuerySchema.LINE.FLOW],
+    "price + generation + flow": [
+        QuerySchema.NODE.PRICE,
+        QuerySchema.GENERATOR.GENERATION,
+        QuerySchema.LINE.FLOW,
+    ],
+}
+
+
+def median_seconds(run: Callable[[], object], repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("zip_file_path")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    solution = PlexosSolution.from_zip(args.zip_file_path)
+    # build the key dimension, the periods and the duckdb connection outside the timings
+    solution.dim_key
+    solution.dim_period
+    solution.duckdb_engine
+
+    print(f"{'shape':<28}{'polars':>10}{'duckdb':>10}  faster")
+    for shape, query_enums in SHAPES.items():
+        polars_seconds = median_seconds(
+            lambda: solution.query_frame(query_enums).collect(), args.repeat
+        )
+        duckdb_seconds = median_seconds(
+            lambda: solution.duckdb_engine.query(query_enums), args.repeat
+        )
+        faster = "polars" if polars_seconds <= duckdb_seconds else "duckdb"
+        print(f"{shape:<28}{polars_seconds:>10.4f}{duckdb_seconds:>10.4f}  {faster}")
+
+
+if __name__ == "__main__":
+    main()
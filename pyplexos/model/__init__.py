@@ -2,7 +2,8 @@ from dataclasses import dataclass, fields
 from typing import Self, Any
 from pathlib import Path
 
-from pyplexos.model.xml import MasterDataSet
+from pyplexos.model.xml import MODEL_SCHEMAS, MasterDataSet
+from pyplexos.utils.arrow import tables_from_model
 
 import pyarrow as pa
 import pyarrow.parquet as pq
@@ -40,16 +41,29 @@ class PlexosModel:
             yield field.name, getattr(self, field.name)
 
     @classmethod
-    def from_xml(cls, xml_file_path: str) -> Self:
+    def from_xml(cls, xml_file_path: str, validate: bool | float = False) -> Self:
+        """Read a Plexos Model from its xml file.
+
+        Args:
+            xml_file_path (str): path to the xml file.
+            validate (bool | float, optional): validate every row with the MasterDataSet
+                table models (True), stream the file straight into arrow tables (False) or
+                stream it validating a fraction of the rows, e.g. 0.01. Defaults to False.
+
+        Returns:
+            PlexosModel: the model tables.
+        """
         path = Path(xml_file_path)
 
         if not path.exists():
             raise FileNotFoundError(f"Path does not exists: {xml_file_path}")
 
         with open(path, "rb") as xml_file:
-            plexos_model = MasterDataSet.from_xml(xml_file).model_dump(by_alias=True)
+            if validate is not True:
+                return cls(**MasterDataSet.tables_from_xml(xml_file, validate=validate))
+            plexos_model = MasterDataSet.from_xml(xml_file)
 
-        return cls(**{table_name: pa.Table.from_pylist(table_data) for table_name, table_data in plexos_model.items()})
+        return cls(**tables_from_model(plexos_model, MODEL_SCHEMAS))
 
     def to_xml(self, xml_file_path: str | None) -> str:
         """Transform Plexos Model to xml format, if file_path is define then it will write the xml file.
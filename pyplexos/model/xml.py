@@ -1,11 +1,15 @@
 import datetime as dt
+import pyarrow as pa
 import xmltodict
 
 # from io import BytesIO, StringIO
 from pydantic import BaseModel, Field, field_serializer
-from typing import Optional, OrderedDict, Any, IO
+from typing import Optional, IO, Iterable
 from pathlib import Path
 
+from pyplexos.utils.arrow import schema_from_model, table_models
+from pyplexos.utils.xml import read_dataset, read_dataset_tables
+
 
 class AttributeTable(BaseModel):
     attribute_id: int
@@ -277,16 +281,28 @@ class MasterDataSet(BaseModel):
     t_property_tag: list[PropertyTagTable]
 
     @classmethod
-    def from_xml(cls, xml_file: str | IO[bytes]):
-        namespace = {"http://tempuri.org/MasterDataSet.xsd": None}
-        force_list_data = [name for name in cls.model_fields.keys()]
-        content: OrderedDict[str, Any] = xmltodict.parse(
-            xml_input=xml_file,
-            force_list=force_list_data,
-            process_namespaces=True,
-            namespaces=namespace,
+    def from_xml(cls, xml_file: str | IO[bytes], validate: bool | float = True):
+        """
+        Read the .xml file into the model, see `read_dataset`.
+        """
+        return read_dataset(
+            cls, "MasterDataSet", xml_file, schemas=MODEL_SCHEMAS, validate=validate
+        )
+
+    @classmethod
+    def tables_from_xml(
+        cls,
+        xml_file: str | IO[bytes],
+        tables: Iterable[str] | None = None,
+        validate: bool | float = False,
+    ) -> dict[str, pa.Table]:
+        """
+        Stream the .xml file into arrow tables typed with MODEL_SCHEMAS, see
+        `read_dataset_tables`.
+        """
+        return read_dataset_tables(
+            cls, xml_file, schemas=MODEL_SCHEMAS, tables=tables, validate=validate
         )
-        return cls(**content["MasterDataSet"])
 
     def to_xml(self, xml_path: Optional[str] = None):
         namespace = {"@xmlns": "http://tempuri.org/MasterDataSet.xsd"}
@@ -310,3 +326,9 @@ class MasterDataSet(BaseModel):
                 file.write(xml_data)
 
         return xml_data
+
+
+MODEL_SCHEMAS: dict[str, pa.Schema] = {
+    table_name: schema_from_model(model)
+    for table_name, model in table_models(MasterDataSet).items()
+}
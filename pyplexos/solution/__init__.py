@@ -1,18 +1,68 @@
-from dataclasses import dataclass, fields
+import datetime as dt
+from dataclasses import dataclass, field, fields
+from functools import cached_property
 from enum import Enum
 from pathlib import Path
-from typing import Any, Self
+from typing import Any, Iterable, Literal, Self
 
+import numpy as np
 import polars as pl
 import pyarrow as pa
 import pyarrow.parquet as pq
 
 from pyplexos.solution.accdb import create_accdb_engine, get_data
-from pyplexos.solution.zip import extract_zip_data
+from pyplexos.solution.cache import (
+    CACHE_MAX_BYTES,
+    QueryCache,
+    read_cache,
+    solution_cache_key,
+    write_cache,
+)
+from pyplexos.solution.zip import KEY_TABLES, extract_zip_data
+from pyplexos.solution.zip.bin import DATA_SCHEMA
+from pyplexos.solution.index import (
+    PERIOD_TABLES,
+    KeyIndex,
+    SolutionMatrix,
+    get_matrix,
+    get_period_datetimes,
+)
+from pyplexos.solution.keys import as_lazy, filter_dim_key, get_dim_key
 
 from pyplexos.solution.schema import QuerySchema
 from pyplexos.solution.schema import SolutionSchema as SolSch
 from pyplexos.solution.duckdb import write_duckdb
+from pyplexos.solution.duckdb.engine import DuckDBEngine
+
+# columns of the frames returned by PlexosSolution.query
+QUERY_COLUMNS: list[str] = [
+    "collection_name",
+    "category_name",
+    "parent_name",
+    "child_name",
+    "property_name",
+    "datetime",
+    "day",
+    "hour",
+    "value",
+]
+
+# tables behind a query of t_data_0: key names, key index and the periods of type 0
+QUERY_TABLES: tuple[str, ...] = (
+    *KEY_TABLES,
+    "t_key_index",
+    "t_period_0",
+    "t_phase_1",
+    "t_phase_2",
+    "t_phase_3",
+    "t_phase_4",
+)
+
+# plus the tables of the other period types, `PlexosSolution.period_datetimes` maps them all
+SERIES_TABLES: tuple[str, ...] = (
+    *QUERY_TABLES,
+    *(table_name for table_name, _, _ in PERIOD_TABLES.values()),
+)
 
 
 @dataclass
@@ -50,6 +100,19 @@ class PlexosSolution:
     t_memo_object: pa.Table
     t_object_meta: pa.Table
     t_data_0: pa.Table
+    t_data_1: pa.Table = field(default_factory=DATA_SCHEMA.empty_table)
+    t_data_2: pa.Table = field(default_factory=DATA_SCHEMA.empty_table)
+    t_data_3: pa.Table = field(default_factory=DATA_SCHEMA.empty_table)
+    t_data_4: pa.Table = field(default_factory=DATA_SCHEMA.empty_table)
+    t_data_6: pa.Table = field(default_factory=DATA_SCHEMA.empty_table)
+    t_data_7: pa.Table = field(default_factory=DATA_SCHEMA.empty_table)
+
+    def __post_init__(self) -> None:
+        # LRU cache of the results of `query`, bounded to 1 GiB. Assign a
+        # `QueryCache(max_bytes=...)` for another budget, `query_cache.stats()` returns its
+        # hit, miss and eviction counters. Created with the solution, so threads querying a
+        # new solution at once share it.
+        self.query_cache = QueryCache()
 
     def items(self):
         for field in fields(self):
@@ -58,49 +121,166 @@ class PlexosSolution:
     def __getitem__(self, item):
         return getattr(self, item)
 
+    def materialize(self, *table_names: str) -> Self:
+        """Make sure some tables are in memory before they are used. The tables of a
+        PlexosSolution always are, `LazyPlexosSolution` reads the missing ones in one pass
+        over its source. Every query and dimension calls it with the tables it needs.
+
+        Args:
+            *table_names (str): tables about to be used.
+
+        Returns:
+            PlexosSolution: the solution itself.
+        """
+        return self
+
+    def binary_data(self, period_type_id: int) -> bytes | memoryview | None:
+        """t_data_N.BIN data of a period type, when the solution keeps it. A PlexosSolution
+        holds its t_data tables already decoded and returns None, `LazyPlexosSolution`
+        returns the BIN files of its zip file.
+
+        Args:
+            period_type_id (int): period type of the BIN file.
+
+        Returns:
+            bytes | memoryview | None: the binary data, None when it is not kept.
+        """
+        return None
+
+    @property
+    def t_phase(self) -> pa.Table:
+        """t_phase_N table of the phase the solution was run with."""
+        phase = self.t_key.column("phase_id")[0].as_py()
+        return getattr(self, f"t_phase_{phase}")
+
     @classmethod
-    def from_zip(cls, zip_file_path: str) -> Self:
+    def from_zip(
+        cls,
+        zip_file_path: str,
+        memory_map: bool = False,
+        extract_dir: str | None = None,
+        collections: Iterable[int | str] | None = None,
+        properties: Iterable[Enum | str] | None = None,
+        objects: Iterable[str] | None = None,
+        batch_rows: int | None = None,
+        validate: bool | float = False,
+        tables: Iterable[str] | None = None,
+        timings: dict[str, float] | None = None,
+        cache_dir: str | None = None,
+        cache_max_bytes: int = CACHE_MAX_BYTES,
+    ) -> Self:
+        """Read a solution from a PLEXOS solution zip file.
+
+        Args:
+            zip_file_path (str): path to the solution zip file.
+            memory_map (bool, optional): memory-map the binary data instead of reading it, so
+                solutions bigger than RAM can be opened. Defaults to False.
+            extract_dir (str | None, optional): folder where compressed binary files are
+                extracted once for memory mapping. Defaults to the system temp folder.
+            collections (Iterable[int | str] | None, optional): only decode the data of these
+                collection ids or names.
+            properties (Iterable[Enum | str] | None, optional): only decode the data of these
+                QuerySchema properties (e.g. QuerySchema.NODE.PRICE) or property names.
+            objects (Iterable[str] | None, optional): only decode the data of these child
+                objects.
+            batch_rows (int | None, optional): stream the t_data tables as
+                pa.RecordBatchReaders of at most this many rows instead of decoding them.
+                Meant for a single to_parquet or to_duck export in constant memory, the
+                readers can be consumed once and do not support queries. Defaults to None.
+            validate (bool | float, optional): validate every XML row with the pydantic table
+                models instead of streaming the XML straight into arrow columns, or a fraction
+                of the rows while streaming (e.g. 0.01) to catch format changes. Defaults to
+                False.
+            tables (Iterable[str] | None, optional): only read these tables, e.g.
+                ["t_data_0", "t_period_0", "t_phase_3"]. The tables they depend on, like
+                t_key_index for the t_data tables, are added and the rest are left empty.
+                Defaults to every table.
+            timings (dict[str, float] | None, optional): filled with the seconds spent
+                parsing the XML, reading and decoding the BIN files, see `extract_zip_data`.
+            cache_dir (str | None, optional): folder of a cache of parsed solutions. The tables
+                are stored there as Arrow IPC files the first time and memory-mapped on later
+                opens of the same zip file, with the same filters and tables. Not used with
+                `batch_rows`. Defaults to None.
+            cache_max_bytes (int, optional): size bound of `cache_dir`, least recently used
+                solutions are evicted past it. Defaults to 10 GiB.
+
+        Returns:
+            PlexosSolution: the solution tables.
+        """
         path = Path(zip_file_path)
 
         if not path.exists():
             raise FileNotFoundError(f"Path does not exists: {zip_file_path}")
 
-        data = extract_zip_data(path=path)
+        use_cache = cache_dir is not None and batch_rows is None
+        if use_cache:
+            cache_key = solution_cache_key(
+                path,
+                collections=collections,
+                properties=properties,
+                objects=objects,
+                tables=tables,
+            )
+            cached = read_cache(cache_dir, cache_key)
+            if cached is not None:
+                return cls(**cached)
+
+        data = extract_zip_data(
+            path=path,
+            memory_map=memory_map,
+            extract_dir=extract_dir,
+            collections=collections,
+            properties=properties,
+            objects=objects,
+            batch_rows=batch_rows,
+            validate=validate,
+            tables=tables,
+            timings=timings,
+        )
+
+        if use_cache:
+            write_cache(cache_dir, cache_key, path, data, max_bytes=cache_max_bytes)
 
         return cls(
-            t_unit=pa.Table.from_pylist(data[SolSch.t_unit.value]),
-            t_band=pa.Table.from_pylist(data[SolSch.t_band.value]),
-            t_category=pa.Table.from_pylist(data[SolSch.t_category.value]),
-            t_class=pa.Table.from_pylist(data[SolSch.t_class.value]),
-            t_class_group=pa.Table.from_pylist(data[SolSch.t_class_group.value]),
-            t_collection=pa.Table.from_pylist(data[SolSch.t_collection.value]),
-            t_config=pa.Table.from_pylist(data[SolSch.t_config.value]),
-            t_key=pa.Table.from_pylist(data[SolSch.t_key.value]),
-            t_membership=pa.Table.from_pylist(data[SolSch.t_membership.value]),
-            t_model=pa.Table.from_pylist(data[SolSch.t_model.value]),
-            t_object=pa.Table.from_pylist(data[SolSch.t_object.value]),
-            t_period_0=pa.Table.from_pylist(data[SolSch.t_period_0.value]),
-            t_period_1=pa.Table.from_pylist(data[SolSch.t_period_1.value]),
-            t_period_2=pa.Table.from_pylist(data[SolSch.t_period_2.value]),
-            t_period_3=pa.Table.from_pylist(data[SolSch.t_period_3.value]),
-            t_period_4=pa.Table.from_pylist(data[SolSch.t_period_4.value]),
-            t_period_6=pa.Table.from_pylist(data[SolSch.t_period_6.value]),
-            t_period_7=pa.Table.from_pylist(data[SolSch.t_period_7.value]),
-            t_phase_1=pa.Table.from_pylist(data[SolSch.t_phase_1.value]),
-            t_phase_2=pa.Table.from_pylist(data[SolSch.t_phase_2.value]),
-            t_phase_3=pa.Table.from_pylist(data[SolSch.t_phase_3.value]),
-            t_phase_4=pa.Table.from_pylist(data[SolSch.t_phase_4.value]),
-            t_sample=pa.Table.from_pylist(data[SolSch.t_sample.value]),
-            t_timeslice=pa.Table.from_pylist(data[SolSch.t_timeslice.value]),
-            t_key_index=pa.Table.from_pylist(data[SolSch.t_key_index.value]),
-            t_property=pa.Table.from_pylist(data[SolSch.t_property.value]),
-            t_attribute_data=pa.Table.from_pylist(data[SolSch.t_attribute_data.value]),
-            t_attribute=pa.Table.from_pylist(data[SolSch.t_attribute.value]),
-            t_sample_weight=pa.Table.from_pylist(data[SolSch.t_sample_weight.value]),
-            t_custom_column=pa.Table.from_pylist(data[SolSch.t_custom_column.value]),
-            t_memo_object=pa.Table.from_pylist(data[SolSch.t_memo_object.value]),
-            t_object_meta=pa.Table.from_pylist(data[SolSch.t_object_meta.value]),
-            t_data_0=pa.Table.from_pydict(data[SolSch.t_data_0.value]),
+            t_unit=data[SolSch.t_unit.value],
+            t_band=data[SolSch.t_band.value],
+            t_category=data[SolSch.t_category.value],
+            t_class=data[SolSch.t_class.value],
+            t_class_group=data[SolSch.t_class_group.value],
+            t_collection=data[SolSch.t_collection.value],
+            t_config=data[SolSch.t_config.value],
+            t_key=data[SolSch.t_key.value],
+            t_membership=data[SolSch.t_membership.value],
+            t_model=data[SolSch.t_model.value],
+            t_object=data[SolSch.t_object.value],
+            t_period_0=data[SolSch.t_period_0.value],
+            t_period_1=data[SolSch.t_period_1.value],
+            t_period_2=data[SolSch.t_period_2.value],
+            t_period_3=data[SolSch.t_period_3.value],
+            t_period_4=data[SolSch.t_period_4.value],
+            t_period_6=data[SolSch.t_period_6.value],
+            t_period_7=data[SolSch.t_period_7.value],
+            t_phase_1=data[SolSch.t_phase_1.value],
+            t_phase_2=data[SolSch.t_phase_2.value],
+            t_phase_3=data[SolSch.t_phase_3.value],
+            t_phase_4=data[SolSch.t_phase_4.value],
+            t_sample=data[SolSch.t_sample.value],
+            t_timeslice=data[SolSch.t_timeslice.value],
+            t_key_index=data[SolSch.t_key_index.value],
+            t_property=data[SolSch.t_property.value],
+            t_attribute_data=data[SolSch.t_attribute_data.value],
+            t_attribute=data[SolSch.t_attribute.value],
+            t_sample_weight=data[SolSch.t_sample_weight.value],
+            t_custom_column=data[SolSch.t_custom_column.value],
+            t_memo_object=data[SolSch.t_memo_object.value],
+            t_object_meta=data[SolSch.t_object_meta.value],
+            t_data_0=data[SolSch.t_data_0.value],
+            t_data_1=data[SolSch.t_data_1.value],
+            t_data_2=data[SolSch.t_data_2.value],
+            t_data_3=data[SolSch.t_data_3.value],
+            t_data_4=data[SolSch.t_data_4.value],
+            t_data_6=data[SolSch.t_data_6.value],
+            t_data_7=data[SolSch.t_data_7.value],
         )
 
     @classmethod
@@ -165,124 +345,588 @@ class PlexosSolution:
 
         for table_name, table_data in self.items():
             path_to_write: Path = path / table_name
+            if isinstance(table_data, pa.RecordBatchReader):
+                with pq.ParquetWriter(
+                    path_to_write.with_suffix(".parquet"), table_data.schema, **kwargs
+                ) as writer:
+                    for batch in table_data:
+                        writer.write_batch(batch)
+                continue
             pq.write_table(table_data, path_to_write.with_suffix(".parquet"), **kwargs)
 
     def to_duck(self, path: str, **kwargs: Any) -> None:
         write_duckdb(path_to_db=path, solution=self, **kwargs)
 
-    def query(self, query_enum: Enum) -> pl.DataFrame:
-        t_membership: pl.LazyFrame = pl.from_arrow(self.t_membership).lazy()  # type: ignore
-        t_parent_object: pl.LazyFrame = pl.from_arrow(self.t_object).lazy()  # type: ignore
-        t_child_object: pl.LazyFrame = pl.from_arrow(self.t_object).lazy()  # type: ignore
-        t_property: pl.LazyFrame = pl.from_arrow(self.t_property).lazy()  # type: ignore
-        t_collection: pl.LazyFrame = pl.from_arrow(self.t_collection).lazy()  # type: ignore
-        t_category: pl.LazyFrame = pl.from_arrow(self.t_category).lazy()  # type: ignore
-        t_key: pl.LazyFrame = pl.from_arrow(self.t_key).lazy()  # type: ignore
-        t_data: pl.LazyFrame = pl.from_arrow(self.t_data_0).lazy()  # type: ignore
-        t_period: pl.LazyFrame = pl.from_arrow(self.t_period_0).lazy()  # type: ignore
-        phase = t_key.select("phase_id").collect().item(0, 0)  # type: ignore
-        match phase:
-            case 1:
-                t_phase: pl.LazyFrame = pl.from_arrow(self.t_phase_1).lazy()  # type: ignore
-            case 2:
-                t_phase: pl.LazyFrame = pl.from_arrow(self.t_phase_2).lazy()  # type: ignore
-            case 3:
-                t_phase: pl.LazyFrame = pl.from_arrow(self.t_phase_3).lazy()  # type: ignore
-            case 4:
-                t_phase: pl.LazyFrame = pl.from_arrow(self.t_phase_4).lazy()  # type: ignore
-
-        data = (
-            t_membership.join(
-                t_collection,
-                on=["collection_id", "parent_class_id", "child_class_id"],
+    def find_keys(
+        self,
+        collections: Iterable[int | str] | None = None,
+        properties: Iterable[Enum | str] | None = None,
+        objects: Iterable[str] | None = None,
+    ) -> pl.DataFrame:
+        """Rows of the key dimension matching the filters, see `filter_dim_key`.
+
+        Args:
+            collections (Iterable[int | str] | None, optional): collection ids or names.
+            properties (Iterable[Enum | str] | None, optional): QuerySchema properties or names.
+            objects (Iterable[str] | None, optional): child object names.
+
+        Returns:
+            pl.DataFrame: matching keys with their names.
+        """
+        return filter_dim_key(
+            self.dim_key.lazy(),
+            collections=collections,
+            properties=properties,
+            objects=objects,
+        ).collect()
+
+    @cached_property
+    def frames(self) -> dict[str, pl.LazyFrame]:
+        """Polars views of the tables already converted by `frame`."""
+        return {}
+
+    def frame(self, table_name: str) -> pl.LazyFrame:
+        """Polars view of a table, converted from arrow and rechunked on first use and shared
+        by every query afterwards. The view does not follow later assignments of the table.
+
+        Args:
+            table_name (str): table name, e.g. "t_object".
+
+        Returns:
+            pl.LazyFrame: the table.
+        """
+        frames = self.frames
+        if table_name not in frames:
+            frames[table_name] = as_lazy(self[table_name])
+        return frames[table_name]
+
+    @cached_property
+    def dim_key(self) -> pl.DataFrame:
+        """Key dimension, one row per key with the names of its collection, property, parent
+        and child objects and category, built once per solution, see `get_dim_key`."""
+        self.materialize(*QUERY_TABLES)
+        return get_dim_key(
+            t_key=self.frame("t_key"),
+            t_membership=self.frame("t_membership"),
+            t_collection=self.frame("t_collection"),
+            t_object=self.frame("t_object"),
+            t_property=self.frame("t_property"),
+            t_category=self.frame("t_category"),
+        ).collect()
+
+    @cached_property
+    def dim_period(self) -> pl.DataFrame:
+        """Intervals of every period of type 0 with their datetime, day and hour of the day,
+        through the phase table of the solution."""
+        self.materialize(*QUERY_TABLES)
+        phase = self.t_key.column("phase_id")[0].as_py()
+        return (
+            self.frame(f"t_phase_{phase}")
+            .join(self.frame("t_period_0"), on="interval_id")
+            .select(
+                pl.col("period_id"),
+                pl.col("interval_id"),
+                pl.col("datetime"),
+                pl.col("day_id").alias("day"),
+                pl.col("period_of_day").alias("hour"),
             )
-            .select(pl.exclude(["complement_name", "lang_id"]))
-            .join(
-                t_parent_object,
-                left_on="parent_object_id",
-                right_on="object_id",
-                suffix="_parent",
+            .collect()
+        )
+
+    @cached_property
+    def duckdb_engine(self) -> DuckDBEngine:
+        """In-memory DuckDB connection with the tables of `query` registered without copies,
+        the phase table of the solution as t_phase."""
+        self.materialize(*QUERY_TABLES, "t_data_0")
+        tables = {
+            table_name: self[table_name]
+            for table_name in (*KEY_TABLES, "t_period_0", "t_data_0")
+        }
+        return DuckDBEngine(tables | {"t_phase": self.t_phase})
+
+    @cached_property
+    def key_index(self) -> KeyIndex:
+        """Index key_id -> location of its values in the t_data tables."""
+        self.materialize(*QUERY_TABLES)
+        return KeyIndex.from_key_index(self.t_key_index)
+
+    @cached_property
+    def data_aligned(self) -> bool:
+        """Whether t_data_0 is in t_key_index order, so `query` can slice its keys by position.
+        Checked once per solution, see `KeyIndex.is_aligned`."""
+        self.materialize(*QUERY_TABLES, "t_data_0")
+        return self.key_index.is_aligned(self.t_data_0, period_type_id=0)
+
+    @cached_property
+    def period_datetimes(self) -> dict[int, np.ndarray]:
+        """Datetime of every period id, by period type id.
+
+        Periods of type 0 are mapped through the phase table to their first interval.
+        """
+        self.materialize(*SERIES_TABLES)
+        periods = self.dim_period.group_by("period_id").agg(
+            pl.col("datetime").sort_by("interval_id").first()
+        )
+        datetimes = {
+            0: get_period_datetimes(
+                periods["period_id"].to_arrow(), periods["datetime"].to_arrow()
             )
-            .select(pl.exclude(["class_id", "category_id", "index", "show", "GUID"]))
-            .join(
-                t_child_object,
-                left_on="child_object_id",
-                right_on="object_id",
-                suffix="_child",
+        }
+
+        for period_type_id, table_columns in PERIOD_TABLES.items():
+            table_name, id_column, datetime_column = table_columns
+            table: pa.Table = self[table_name]
+            if table.num_columns == 0:
+                continue
+            datetimes[period_type_id] = get_period_datetimes(
+                table.column(id_column), table.column(datetime_column)
             )
-            .select(pl.exclude(["class_id", "index", "show", "GUID"]))
-            .join(t_property, on="collection_id", suffix="_property")
-            .select(
-                pl.exclude(
-                    [
-                        "enum_id",
-                        "summary_name",
-                        "summary_unit_id",
-                        "is_multi_band",
-                        "is_period",
-                        "is_summary",
-                        "lang_id",
-                        "unit_id",
-                    ]
-                )
+
+        return datetimes
+
+    def series(
+        self,
+        key: int | str,
+        property: Enum | str | None = None,
+        period_type_id: int = 0,
+    ) -> pa.Table:
+        """Read the time series of a single key without touching the rest of the data. When
+        the solution keeps its BIN data the values are read straight from the key position in
+        the file, without decoding t_data_N.
+
+        Args:
+            key (int | str): key_id, or a child object name together with `property`.
+            property (Enum | str | None, optional): QuerySchema property or property name,
+                required when `key` is an object name.
+            period_type_id (int, optional): period type of the series when `key` is an object
+                name. Defaults to 0.
+
+        Raises:
+            ValueError: If the object and property do not match exactly one key.
+
+        Returns:
+            pa.Table: datetime and value columns, the value column is a slice of t_data_N or
+                a view over the t_data_N.BIN data, see `binary_data`.
+        """
+        self.materialize(*SERIES_TABLES)
+        if isinstance(key, str):
+            if property is None:
+                raise ValueError("property is required to look up a series by object")
+            key_ids = (
+                self.find_keys(properties=[property], objects=[key])
+                .filter(pl.col("period_type_id").eq(period_type_id))
+                .get_column("key_id")
+                .to_list()
             )
-            .join(t_key, on=["membership_id", "property_id"])
-            .select(
-                pl.exclude(
-                    [
-                        "model_id",
-                        "period_type_id",
-                        "band_id",
-                        "sample_id",
-                        "timeslice_id",
-                    ]
+            if len(key_ids) != 1:
+                raise ValueError(
+                    f"{key} {property} matches {len(key_ids)} keys, use the key_id"
                 )
+            key = key_ids[0]
+
+        entry = self.key_index[key]
+        binary_data = self.binary_data(entry.period_type_id)
+        if binary_data is not None:
+            values = self.key_index.read(binary_data, key)
+        else:
+            table_name = f"t_data_{entry.period_type_id}"
+            self.materialize(table_name)
+            values = self.key_index.slice(self[table_name], key).column("value")
+        period_ids = np.arange(1, entry.length + 1) + entry.period_offset
+
+        return pa.table(
+            {
+                "datetime": self.period_datetimes[entry.period_type_id][period_ids],
+                "value": values,
+            }
+        )
+
+    def matrix(
+        self,
+        query_enum: Enum,
+        period_type_id: int = 0,
+        objects: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+        periods: tuple[int, int] | None = None,
+    ) -> SolutionMatrix:
+        """Values of a property as a (n_objects, n_periods) matrix.
+
+        Most keys of a property share length and period offset and are stored one after the
+        other, in that case the matrix is a reshaped view of t_data_N without copies. Only
+        the keys of the selected objects and the periods of `periods` are read.
+
+        Args:
+            query_enum (Enum): QuerySchema property, e.g. QuerySchema.NODE.PRICE.
+            period_type_id (int, optional): period type of the values. Defaults to 0.
+            objects (Iterable[str] | None, optional): only these child objects.
+            categories (Iterable[str] | None, optional): only the objects of these categories.
+            periods (tuple[int, int] | None, optional): first and last period_id, both
+                included, e.g. from `period_range`. Defaults to every period.
+
+        Raises:
+            ValueError: If an object has more than one key for the property (bands, samples),
+                or if t_data_N is not in t_key_index order.
+
+        Returns:
+            SolutionMatrix: matrix, object name of every row and datetime of every column.
+        """
+        self.materialize(*SERIES_TABLES, f"t_data_{period_type_id}")
+        keys = self.find_keys(properties=[query_enum], objects=objects).filter(
+            pl.col("period_type_id").eq(period_type_id),
+            pl.col("key_id").is_in(list(self.key_index.entries)),
+        )
+        if categories is not None:
+            keys = keys.filter(pl.col("category_name").is_in(list(categories)))
+        if keys.get_column("child_name").is_duplicated().any():
+            raise ValueError(f"{query_enum} has more than one key per object")
+
+        # rows in storage order, so the matrix can be a view of t_data_N
+        key_ids = keys.get_column("key_id").to_list()
+        entries = [self.key_index[key_id] for key_id in key_ids]
+        order = np.argsort([entry.row_start for entry in entries], kind="stable")
+
+        values, period_ids = get_matrix(
+            self[f"t_data_{period_type_id}"],
+            [entries[row] for row in order],
+            [key_ids[row] for row in order],
+            periods=periods,
+        )
+        return SolutionMatrix(
+            values=values,
+            objects=keys.get_column("child_name").gather(order).to_list(),
+            datetimes=self.period_datetimes[period_type_id][period_ids],
+        )
+
+    def query(
+        self,
+        query_enum: Enum,
+        layout: Literal["long", "wide"] = "long",
+        engine: Literal["polars", "duckdb"] = "polars",
+        ids_only: bool = False,
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        objects: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+    ) -> pl.DataFrame:
+        """Values of a property of t_data_0 with the names of their keys and their datetime.
+
+        The property is resolved to its key_ids on the cached `dim_key` first, then only the
+        rows of those keys are sliced out of t_data_0 through the key index, so the cost of a
+        query follows the size of the selected series and not the size of t_data_0. A time
+        window is mapped to a period_id interval through the phase and period tables and
+        only that sub-range of every key is sliced. Results are kept in `query_cache`,
+        repeated queries (e.g. `gen`, `cmg`) return a copy of the cached frame without
+        running again.
+
+        Args:
+            query_enum (Enum): QuerySchema property, e.g. QuerySchema.NODE.PRICE.
+            layout (Literal["long", "wide"], optional): "long" returns a row per object and
+                interval. "wide" returns a row per period with a datetime column (the first
+                interval of the period) and a value column per object, see `query_wide`.
+                Defaults to "long".
+            engine (Literal["polars", "duckdb"], optional): backend of the "long" layout.
+                "polars" slices the keys out of t_data_0 and joins them in polars, "duckdb"
+                runs the joins as SQL over the whole t_data_0 in `duckdb_engine`, with the
+                key filter pushed down to the scan. Same rows, in no particular order with
+                "duckdb". Defaults to "polars".
+            ids_only (bool, optional): return only the key_id, period_id and value columns of
+                the long layout, straight from t_data_0 without any join. The names are in
+                `dim_key` (by key_id) and the datetimes in `dim_period` (by period_id), to be
+                joined when needed. Defaults to False.
+            start (dt.datetime | None, optional): first datetime of the window, included.
+            end (dt.datetime | None, optional): end of the window, excluded.
+            objects (Iterable[str] | None, optional): only these child objects.
+            categories (Iterable[str] | None, optional): only the objects of these categories.
+
+        Raises:
+            ValueError: If the layout or the engine is unknown, if `ids_only` is not used
+                with the long layout, or for "wide" if an object has more than one key for
+                the property.
+
+        Returns:
+            pl.DataFrame: collection, category, parent, child and property names, datetime,
+                day, hour and value of every interval, or datetime and a column per object.
+        """
+        objects = tuple(objects) if objects is not None else None
+        categories = tuple(categories) if categories is not None else None
+        return self.query_cache.get(
+            ("query", query_enum, layout, engine, ids_only, start, end, objects, categories),
+            lambda: self.run_query(
+                query_enum,
+                layout,
+                engine,
+                ids_only,
+                start=start,
+                end=end,
+                objects=objects,
+                categories=categories,
+            ),
+        )
+
+    def run_query(
+        self,
+        query_enum: Enum,
+        layout: Literal["long", "wide"] = "long",
+        engine: Literal["polars", "duckdb"] = "polars",
+        ids_only: bool = False,
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        objects: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+    ) -> pl.DataFrame:
+        """`query` without the query cache."""
+        self.materialize(*QUERY_TABLES, "t_data_0")
+        if engine not in ("polars", "duckdb"):
+            raise ValueError(f"unknown engine: {engine}")
+        if ids_only and layout != "long":
+            raise ValueError("ids_only is only available with the long layout")
+
+        if layout == "wide":
+            return self.query_wide(
+                query_enum, start=start, end=end, objects=objects, categories=categories
             )
-            .join(t_data, on="key_id")
-            .join(t_phase, on="period_id")
-            .join(
-                t_period.select(["interval_id", "day_id", "period_of_day", "datetime"]),
-                on="interval_id",
+        if layout != "long":
+            raise ValueError(f"unknown layout: {layout}")
+
+        if ids_only:
+            return self.query_ids(
+                self.query_keys([query_enum], objects=objects, categories=categories),
+                periods=self.period_range(start, end),
             )
-            .join(
-                t_category.select(["category_id", "name"]),
-                on="category_id",
-                suffix="_category",
+
+        if engine == "duckdb":
+            return self.duckdb_engine.query(
+                [query_enum], start=start, end=end, objects=objects, categories=categories
+            ).select(QUERY_COLUMNS)
+
+        return (
+            self.query_frame(
+                [query_enum], start=start, end=end, objects=objects, categories=categories
+            )
+            .select(QUERY_COLUMNS)
+            .collect()
+        )
+
+    def query_wide(
+        self,
+        query_enum: Enum,
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        objects: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+    ) -> pl.DataFrame:
+        """`query` with the wide layout: a row per period with the datetime of its first
+        interval and a value column per object, in storage order.
+
+        The frame is built from `matrix`, without the long frame, and only the keys of the
+        selected objects and the periods of the window are read. When t_data_0 is not in
+        t_key_index order, e.g. read from an accdb, the rows of the keys are filtered by
+        key_id (see `query_ids`) and pivoted instead.
+
+        Args:
+            query_enum (Enum): QuerySchema property, e.g. QuerySchema.NODE.PRICE.
+            start (dt.datetime | None, optional): first datetime, included.
+            end (dt.datetime | None, optional): end of the window, excluded.
+            objects (Iterable[str] | None, optional): child object names.
+            categories (Iterable[str] | None, optional): category names.
+
+        Raises:
+            ValueError: If an object has more than one key for the property.
+
+        Returns:
+            pl.DataFrame: datetime and a column per object.
+        """
+        periods = self.period_range(start, end)
+        if self.data_aligned:
+            matrix = self.matrix(
+                query_enum, objects=objects, categories=categories, periods=periods
             )
-            .rename(
+            return pl.DataFrame(
                 {
-                    "name": "collection_name",
-                    "name_parent": "parent_name",
-                    "name_child": "child_name",
-                    "name_property": "property_name",
-                    "name_category": "category_name",
-                    "day_id": "day",
-                    "period_of_day": "hour",
+                    "datetime": matrix.datetimes,
+                    **{
+                        object_name: matrix.values[row]
+                        for row, object_name in enumerate(matrix.objects)
+                    },
                 }
+            ).filter(window_predicate(start, end))
+
+        keys = self.query_keys([query_enum], objects=objects, categories=categories)
+        if keys.get_column("child_name").is_duplicated().any():
+            raise ValueError(f"{query_enum} has more than one key per object")
+
+        # columns in storage order, like the rows of `matrix`
+        names = [
+            object_name
+            for _, object_name in sorted(
+                (self.key_index[key_id].row_start, object_name)
+                for key_id, object_name in keys.select("key_id", "child_name").iter_rows()
+                if key_id in self.key_index
             )
+        ]
+        wide = (
+            self.query_ids(keys, periods=periods)
+            .join(
+                keys.select("key_id", pl.col("child_name").cast(pl.String)), on="key_id"
+            )
+            .pivot(on="child_name", index="period_id", values="value")
+            .sort("period_id")
+        )
+        return pl.DataFrame(
+            {
+                "datetime": self.period_datetimes[0][wide.get_column("period_id")],
+                **{
+                    object_name: wide.get_column(object_name).fill_null(np.nan)
+                    for object_name in names
+                    if object_name in wide.columns
+                },
+            }
+        ).filter(window_predicate(start, end))
+
+    def query_many(
+        self, query_enums: Iterable[Enum], long: bool = False
+    ) -> dict[Enum, pl.DataFrame] | pl.DataFrame:
+        """Query several properties at once, see `query`.
+
+        The keys of every property are resolved in a single filter of `dim_key`, t_data_0 is
+        sliced once for all of them and joined once with the periods. The shared result is
+        then split by property with `pl.collect_all`, in parallel.
+
+        Args:
+            query_enums (Iterable[Enum]): QuerySchema properties.
+            long (bool, optional): return a single frame with the rows of every property,
+                told apart by their collection_name and property_name columns, instead of a
+                frame per property. Defaults to False.
+
+        Returns:
+            dict[Enum, pl.DataFrame] | pl.DataFrame: the frame of every property, or one long
+                frame.
+        """
+        query_enums = list(query_enums)
+        data = self.query_frame(query_enums).collect()
+
+        if long:
+            return data.select(QUERY_COLUMNS)
+
+        frames = pl.collect_all(
+            [
+                data.lazy()
+                .filter(
+                    pl.col("collection_id").eq(query_enum.value[0]),
+                    pl.col("property_name").eq(query_enum.value[2]),
+                )
+                .select(QUERY_COLUMNS)
+                for query_enum in query_enums
+            ]
         )
-        collection_value, _, property_name = query_enum.value
+        return {query_enum: frames[index] for index, query_enum in enumerate(query_enums)}
+
+    def query_frame(
+        self,
+        query_enums: Iterable[Enum],
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        objects: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+    ) -> pl.LazyFrame:
+        """Plan of `query` for several properties: the names of every key, its rows of
+        t_data_0 and the datetime, day and hour of every interval.
+
+        Args:
+            query_enums (Iterable[Enum]): QuerySchema properties.
+            start (dt.datetime | None, optional): first datetime, included.
+            end (dt.datetime | None, optional): end of the window, excluded.
+            objects (Iterable[str] | None, optional): child object names.
+            categories (Iterable[str] | None, optional): category names.
+
+        Returns:
+            pl.LazyFrame: the dim_key columns of the keys with their period and value columns.
+        """
+        self.materialize(*QUERY_TABLES, "t_data_0")
+        keys = self.query_keys(query_enums, objects=objects, categories=categories)
+        rows = self.query_ids(keys, periods=self.period_range(start, end))
         return (
-            data.filter(
-                pl.col("collection_id").eq(collection_value),
-                pl.col("property_name").eq(property_name),
-            )
+            keys.lazy()
+            .join(rows.lazy(), on="key_id")
+            .join(self.dim_period.lazy(), on="period_id")
+            # periods of several intervals can cross the window limits
+            .filter(window_predicate(start, end))
+        )
+
+    def query_keys(
+        self,
+        query_enums: Iterable[Enum],
+        objects: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+    ) -> pl.DataFrame:
+        """Rows of `dim_key` of the period type 0 keys of several properties, optionally only
+        of some child objects or categories."""
+        predicate = pl.lit(False)
+        for query_enum in query_enums:
+            collection_id, _, property_name = query_enum.value
+            predicate |= pl.col("collection_id").eq(collection_id) & pl.col(
+                "property_name"
+            ).eq(property_name)
+
+        predicates = [predicate, pl.col("period_type_id").eq(0)]
+        if objects is not None:
+            predicates.append(pl.col("child_name").is_in(list(objects)))
+        if categories is not None:
+            predicates.append(pl.col("category_name").is_in(list(categories)))
+
+        return self.dim_key.filter(*predicates)
+
+    def query_ids(
+        self, keys: pl.DataFrame, periods: tuple[int, int] | None = None
+    ) -> pl.DataFrame:
+        """key_id, period_id and value rows of some keys, sliced out of t_data_0, optionally
+        only in an interval of period ids, see `KeyIndex.take`. When t_data_0 is not in
+        t_key_index order, e.g. read from an accdb, the rows are filtered by key_id instead."""
+        self.materialize(*QUERY_TABLES, "t_data_0")
+        key_ids = keys.get_column("key_id")
+        if self.data_aligned:
+            rows = self.key_index.take(self.t_data_0, key_ids.to_list(), periods=periods)
+            return pl.from_arrow(rows)  # type: ignore
+
+        predicate = pl.col("key_id").is_in(key_ids)
+        if periods is not None:
+            predicate &= pl.col("period_id").is_between(*periods)
+        return (
+            self.frame("t_data_0")
+            .filter(predicate)
             .select(
-                [
-                    "collection_name",
-                    "category_name",
-                    "parent_name",
-                    "child_name",
-                    "property_name",
-                    "datetime",
-                    "day",
-                    "hour",
-                    "value",
-                ]
+                pl.col("key_id").cast(key_ids.dtype),
+                pl.col("period_id").cast(self.dim_period.schema["period_id"]),
+                pl.col("value"),
             )
             .collect()
         )
 
+    def period_range(
+        self, start: dt.datetime | None = None, end: dt.datetime | None = None
+    ) -> tuple[int, int] | None:
+        """Interval of the period ids of type 0 with an interval in [start, end).
+
+        Args:
+            start (dt.datetime | None, optional): first datetime, included.
+            end (dt.datetime | None, optional): end of the window, excluded.
+
+        Returns:
+            tuple[int, int] | None: first and last period_id, both included, None without a
+                window. An empty window returns (1, 0).
+        """
+        if start is None and end is None:
+            return None
+
+        periods = self.dim_period.filter(window_predicate(start, end)).select(
+            pl.col("period_id").min().alias("first"),
+            pl.col("period_id").max().alias("last"),
+        )
+        first, last = periods.row(0)
+        if first is None:
+            return (1, 0)
+        return (first, last)
+
     @property
     def gen(self) -> pl.DataFrame:
         return self.query(QuerySchema.GENERATOR.GENERATION)
@@ -308,3 +952,15 @@ class PlexosSolution:
         return self.query(QuerySchema.STORAGE.SHADOW_PRICE).with_columns(
             (pl.col("value") * 1000 / 86400).alias("value")
         )
+
+
+def window_predicate(
+    start: dt.datetime | None = None, end: dt.datetime | None = None
+) -> pl.Expr:
+    """Rows whose datetime is in [start, end), either limit can be left open."""
+    predicate = pl.lit(True)
+    if start is not None:
+        predicate &= pl.col("datetime").ge(start)
+    if end is not None:
+        predicate &= pl.col("datetime").lt(end)
+    return predicate
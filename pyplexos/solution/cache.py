@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Hashable
+from zipfile import ZipFile
+
+import polars as pl
+import pyarrow as pa
+
+# size bound of a cache folder, least recently used solutions are evicted past it
+CACHE_MAX_BYTES = 10 * 1024**3
+
+# size bound of the in-memory query results of a solution, see QueryCache
+QUERY_CACHE_MAX_BYTES = 1024**3
+
+SOURCE_FILE = "source.json"
+TABLE_SUFFIX = ".arrow"
+
+
+def solution_cache_key(zip_path: str | Path, **load_args: Any) -> str:
+    """Key of a solution in the cache.
+
+    The key changes with the size and modification time of the zip file, with its content (the
+    name, size and CRC-32 of every member, read from the zip central directory without
+    decompressing anything) and with the arguments the solution is loaded with.
+
+    Args:
+        zip_path (str | Path): path to the solution zip file.
+        **load_args (Any): arguments that change the loaded tables, e.g. filters.
+
+    Returns:
+        str: hex sha256 digest.
+    """
+    path = Path(zip_path)
+    stat = path.stat()
+
+    digest = hashlib.sha256()
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with ZipFile(path, "r") as zip_ref:
+        for info in sorted(zip_ref.infolist(), key=lambda info: info.filename):
+            digest.update(f"{info.filename}:{info.file_size}:{info.CRC}".encode())
+    digest.update(
+        json.dumps(
+            {name: normalize_arg(value) for name, value in load_args.items()},
+            sort_keys=True,
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+def normalize_arg(value: Any) -> Any:
+    """JSON representation of a load argument, iterables are sorted so order does not matter."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    return sorted((normalize_arg(item) for item in value), key=repr)
+
+
+def read_cache(cache_dir: str | Path, key: str) -> dict[str, pa.Table] | None:
+    """Read the tables of a cached solution, memory-mapping the Arrow IPC files.
+
+    Args:
+        cache_dir (str | Path): cache folder.
+        key (str): key from `solution_cache_key`.
+
+    Returns:
+        dict[str, pa.Table] | None: the tables by name, None if the solution is not cached.
+    """
+    entry = Path(cache_dir) / key
+    if not (entry / SOURCE_FILE).exists():
+        return None
+
+    tables = {}
+    for table_path in entry.glob(f"*{TABLE_SUFFIX}"):
+        with pa.memory_map(str(table_path), "r") as source:
+            tables[table_path.stem] = pa.ipc.open_file(source).read_all()
+
+    # last access time of the entry, used by the LRU eviction
+    os.utime(entry)
+    return tables
+
+
+def write_cache(
+    cache_dir: str | Path,
+    key: str,
+    zip_path: str | Path,
+    tables: dict[str, pa.Table],
+    max_bytes: int = CACHE_MAX_BYTES,
+) -> None:
+    """Store the tables of a solution as Arrow IPC files and evict old solutions.
+
+    The entry is written to a temporary folder and renamed into place, so readers never see a
+    partial entry.
+
+    Args:
+        cache_dir (str | Path): cache folder.
+        key (str): key from `solution_cache_key`.
+        zip_path (str | Path): solution zip file, recorded for `invalidate_cache`.
+        tables (dict[str, pa.Table]): tables to store.
+        max_bytes (int, optional): size bound of the cache folder. Defaults to CACHE_MAX_BYTES.
+    """
+    cache_path = Path(cache_dir)
+    cache_path.mkdir(parents=True, exist_ok=True)
+    entry = cache_path / key
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=cache_path))
+    try:
+        for table_name, table in tables.items():
+            with pa.OSFile(str(staging / f"{table_name}{TABLE_SUFFIX}"), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        (staging / SOURCE_FILE).write_text(
+            json.dumps({"zip_path": str(Path(zip_path).resolve())})
+        )
+        os.replace(staging, entry)
+    except OSError:
+        # another process stored the same entry first
+        shutil.rmtree(staging, ignore_errors=True)
+        if not (entry / SOURCE_FILE).exists():
+            raise
+
+    evict_cache(cache_path, max_bytes=max_bytes, keep=key)
+
+
+def cache_entries(cache_dir: str | Path) -> list[tuple[Path, int]]:
+    """Entries of a cache folder with their size in bytes, least recently used first."""
+    entries = [
+        entry
+        for entry in Path(cache_dir).iterdir()
+        if entry.is_dir() and (entry / SOURCE_FILE).exists()
+    ]
+    entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+    return [
+        (entry, sum(file.stat().st_size for file in entry.iterdir()))
+        for entry in entries
+    ]
+
+
+def evict_cache(
+    cache_dir: str | Path, max_bytes: int = CACHE_MAX_BYTES, keep: str | None = None
+) -> list[Path]:
+    """Remove least recently used solutions until the cache folder fits in `max_bytes`.
+
+    Args:
+        cache_dir (str | Path): cache folder.
+        max_bytes (int, optional): size bound. Defaults to CACHE_MAX_BYTES.
+        keep (str | None, optional): key that is never evicted, e.g. the one just written.
+
+    Returns:
+        list[Path]: removed entries.
+    """
+    entries = cache_entries(cache_dir)
+    total = sum(size for _, size in entries)
+
+    removed = []
+    for entry, size in entries:
+        if total <= max_bytes:
+            break
+        if entry.name == keep:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        removed.append(entry)
+        total -= size
+    return removed
+
+
+def invalidate_cache(
+    cache_dir: str | Path, zip_path: str | Path | None = None
+) -> list[Path]:
+    """Remove the cached solutions of a zip file, or every cached solution.
+
+    Args:
+        cache_dir (str | Path): cache folder.
+        zip_path (str | Path | None, optional): solution zip file whose entries are removed,
+            whatever arguments they were loaded with. Defaults to every entry.
+
+    Returns:
+        list[Path]: removed entries.
+    """
+    if not Path(cache_dir).exists():
+        return []
+
+    source = str(Path(zip_path).resolve()) if zip_path is not None else None
+
+    removed = []
+    for entry, _ in cache_entries(cache_dir):
+        if source is not None:
+            entry_source = json.loads((entry / SOURCE_FILE).read_text())["zip_path"]
+            if entry_source != source:
+                continue
+        shutil.rmtree(entry, ignore_errors=True)
+        removed.append(entry)
+    return removed
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results bounded by their size in bytes.
+
+    Results are measured with `estimated_size` (polars) or `nbytes` (arrow) and the least
+    recently used ones are evicted past `max_bytes`. A result bigger than the whole budget is
+    returned without being stored. Concurrent misses of the same key compute it once, the
+    other threads wait for that result. Callers get a shallow clone of polars results, so
+    renaming or adding columns in place does not change the cached one.
+    """
+
+    def __init__(self, max_bytes: int = QUERY_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.pending: dict[Hashable, Future] = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached result of `key`, computed with `compute` on a miss.
+
+        Args:
+            key (Hashable): query and its arguments.
+            compute (Callable[[], Any]): computes the result.
+
+        Returns:
+            Any: the result.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return clone_result(self.entries[key][0])
+            self.misses += 1
+            future = self.pending.get(key)
+            owner = future is None
+            if owner:
+                future = self.pending[key] = Future()
+
+        if not owner:
+            return clone_result(future.result())
+
+        try:
+            result = compute()
+        except BaseException as error:
+            with self.lock:
+                del self.pending[key]
+            future.set_exception(error)
+            raise
+
+        with self.lock:
+            del self.pending[key]
+            self.put(key, result)
+        future.set_result(result)
+        return clone_result(result)
+
+    def put(self, key: Hashable, result: Any) -> None:
+        # called with the lock held
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (result, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.nbytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the cache: hits, misses, evictions, entries and bytes."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.nbytes,
+            }
+
+
+def clone_result(result: Any) -> Any:
+    """Copy of a query result that shares its column buffers."""
+    if isinstance(result, pl.DataFrame):
+        return result.clone()
+    return result
+
+
+def result_size(result: Any) -> int:
+    """Size in bytes of a query result."""
+    if isinstance(result, pl.DataFrame):
+        return result.estimated_size()
+    if isinstance(result, (pa.Table, pa.RecordBatch)):
+        return result.nbytes
+    return sys.getsizeof(result)
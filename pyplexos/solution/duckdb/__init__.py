@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Any
 
 import duckdb as duck
+import pyarrow as pa
 
 from pyplexos.solution.schema import SolutionProtocol
 
@@ -25,7 +26,8 @@ def write_duckdb(
     conn = duck.connect(db_path.as_posix())
 
     for table_name, table_data in solution.items():
-        if table_data.num_columns == 0:
+        # RecordBatchReaders are streamed batch by batch into the table
+        if isinstance(table_data, pa.Table) and table_data.num_columns == 0:
             continue 
         conn.from_arrow(table_data).create(table_name=table_name)
     
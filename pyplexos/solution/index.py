@@ -0,0 +1,343 @@
+from dataclasses import dataclass
+from typing import Iterable, NamedTuple, Self
+
+import numpy as np
+import pyarrow as pa
+
+# period type id: (period table, id column, datetime column)
+PERIOD_TABLES: dict[int, tuple[str, str, str]] = {
+    1: ("t_period_1", "day_id", "date"),
+    2: ("t_period_2", "week_id", "week_ending"),
+    3: ("t_period_3", "month_id", "month_beginning"),
+    4: ("t_period_4", "fiscal_year_id", "year_ending"),
+    6: ("t_period_6", "hour_id", "datetime"),
+    7: ("t_period_7", "quarter_id", "quarter_beginning"),
+}
+
+
+class KeyEntry(NamedTuple):
+    """
+    Location of the values of a key inside its t_data_N table and its t_data_N.BIN file.
+    """
+
+    period_type_id: int
+    row_start: int
+    length: int
+    period_offset: int
+    position: int
+
+
+@dataclass
+class KeyIndex:
+    """
+    Index over t_key_index: key_id -> location of its values.
+
+    The t_data_N tables hold the keys of period type N in t_key_index order, one run of `length`
+    rows per key, so the run of a key starts at the sum of the lengths of the keys before it.
+    """
+
+    entries: dict[int, KeyEntry]
+
+    @classmethod
+    def from_key_index(cls, t_key_index: pa.Table) -> Self:
+        """Build the index from the t_key_index table the t_data tables were decoded with.
+
+        Args:
+            t_key_index (pa.Table): t_key_index table.
+
+        Returns:
+            KeyIndex: index by key_id.
+        """
+        key_id = t_key_index.column("key_id").to_numpy()
+        period_type_id = t_key_index.column("period_type_id").to_numpy()
+        length = t_key_index.column("length").to_numpy().astype(np.int64)
+        period_offset = t_key_index.column("period_offset").to_numpy()
+        position = t_key_index.column("position").to_numpy()
+
+        row_start = np.zeros(len(key_id), dtype=np.int64)
+        for period_type in np.unique(period_type_id):
+            mask = period_type_id == period_type
+            row_start[mask] = np.cumsum(length[mask]) - length[mask]
+
+        return cls(
+            entries={
+                key: KeyEntry(*entry)
+                for key, *entry in zip(
+                    key_id.tolist(),
+                    period_type_id.tolist(),
+                    row_start.tolist(),
+                    length.tolist(),
+                    period_offset.tolist(),
+                    position.tolist(),
+                )
+            }
+        )
+
+    def __getitem__(self, key_id: int) -> KeyEntry:
+        return self.entries[key_id]
+
+    def __contains__(self, key_id: int) -> bool:
+        return key_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def is_aligned(self, t_data: pa.Table, period_type_id: int) -> bool:
+        """Whether a t_data table has the layout `slice` and `take` read: the runs of the
+        keys of its period type in t_key_index order, every run sorted by period.
+
+        Args:
+            t_data (pa.Table): t_data table of the period type.
+            period_type_id (int): period type of the table.
+
+        Returns:
+            bool: True if the keys can be read by position.
+        """
+        entries = sorted(
+            (entry, key_id)
+            for key_id, entry in self.entries.items()
+            if entry.period_type_id == period_type_id
+        )
+        lengths = np.array([entry.length for entry, _ in entries], dtype=np.int64)
+        if lengths.sum() != t_data.num_rows:
+            return False
+
+        run_starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        key_ids = np.repeat([key_id for _, key_id in entries], lengths)
+        period_ids = (
+            np.repeat([entry.period_offset for entry, _ in entries], lengths)
+            + np.arange(t_data.num_rows)
+            - run_starts
+            + 1
+        )
+        return np.array_equal(
+            t_data.column("key_id").to_numpy(), key_ids
+        ) and np.array_equal(t_data.column("period_id").to_numpy(), period_ids)
+
+    def slice(self, t_data: pa.Table, key_id: int) -> pa.Table:
+        """Zero-copy slice of the rows of a key.
+
+        Args:
+            t_data (pa.Table): t_data table of the key period type.
+            key_id (int): key to read.
+
+        Raises:
+            ValueError: If the t_data table is not in t_key_index order.
+
+        Returns:
+            pa.Table: rows of the key.
+        """
+        entry = self.entries[key_id]
+        rows = t_data.slice(entry.row_start, entry.length)
+
+        if entry.length and rows.column("key_id")[0].as_py() != key_id:
+            raise ValueError(
+                f"t_data_{entry.period_type_id} is not aligned with t_key_index"
+            )
+
+        return rows
+
+    def read(self, binary_data: bytes | memoryview, key_id: int) -> np.ndarray:
+        """Values of a key read straight from its t_data_N.BIN data, without decoding the
+        rest of the file. Only the bytes of the key are touched, so a memory map is only
+        paged in for them.
+
+        Args:
+            binary_data (bytes | memoryview): t_data_N.BIN data of the key period type.
+            key_id (int): key to read.
+
+        Raises:
+            ValueError: If the key points outside of the binary data.
+
+        Returns:
+            np.ndarray: values of the key, a view over `binary_data`.
+        """
+        entry = self.entries[key_id]
+        if entry.position + entry.length * 8 > len(binary_data):
+            raise ValueError(f"key {key_id} points outside of the binary data")
+
+        return np.frombuffer(
+            binary_data, dtype="<f8", count=entry.length, offset=entry.position
+        )
+
+    def take(
+        self,
+        t_data: pa.Table,
+        key_ids: Iterable[int],
+        periods: tuple[int, int] | None = None,
+    ) -> pa.Table:
+        """Rows of several keys of the same period type, read as zero-copy slices.
+
+        Runs of keys stored one after the other are read as a single slice, so the cost is
+        proportional to the rows of the keys and not to the size of `t_data`. Keys that are
+        not in the index are skipped. With `periods` only the sub-range of every key inside
+        the period interval is sliced, the row of period_id p of a key is
+        `row_start + p - period_offset - 1`.
+
+        Args:
+            t_data (pa.Table): t_data table of the keys period type.
+            key_ids (Iterable[int]): keys to read.
+            periods (tuple[int, int] | None, optional): first and last period_id to read,
+                both included. Defaults to every period.
+
+        Raises:
+            ValueError: If the t_data table is not in t_key_index order.
+
+        Returns:
+            pa.Table: rows of the keys, in storage order.
+        """
+        entries = sorted(
+            (self.entries[key_id], key_id) for key_id in key_ids if key_id in self.entries
+        )
+        entries = [(entry, key_id) for entry, key_id in entries if entry.length]
+        if not entries:
+            return t_data.schema.empty_table()
+
+        first_key_ids = t_data.column("key_id").take(
+            pa.array([entry.row_start for entry, _ in entries], type=pa.int64())
+        )
+        if first_key_ids.to_pylist() != [key_id for _, key_id in entries]:
+            raise ValueError(
+                f"t_data_{entries[0][0].period_type_id} is not aligned with t_key_index"
+            )
+
+        ranges: list[list[int]] = []
+        for entry, _ in entries:
+            start, stop = 0, entry.length
+            if periods is not None:
+                start = max(start, periods[0] - entry.period_offset - 1)
+                stop = min(stop, periods[1] - entry.period_offset)
+                if start >= stop:
+                    continue
+            if ranges and ranges[-1][1] == entry.row_start + start:
+                ranges[-1][1] = entry.row_start + stop
+            else:
+                ranges.append([entry.row_start + start, entry.row_start + stop])
+
+        if not ranges:
+            return t_data.schema.empty_table()
+
+        return pa.concat_tables(
+            [t_data.slice(start, stop - start) for start, stop in ranges]
+        )
+
+
+def get_period_datetimes(period_ids: pa.Array, datetimes: pa.Array) -> np.ndarray:
+    """Dense lookup array: position `period_id` holds the datetime of that period.
+
+    Args:
+        period_ids (pa.Array): period ids.
+        datetimes (pa.Array): datetime of every period id.
+
+    Returns:
+        np.ndarray: datetime64 array indexed by period id, NaT for unknown ids.
+    """
+    ids = period_ids.to_numpy(zero_copy_only=False)
+    values = datetimes.to_numpy(zero_copy_only=False)
+
+    size = int(ids.max()) + 1 if len(ids) else 0
+    lookup = np.full(size, np.datetime64("NaT"), dtype=values.dtype)
+    lookup[ids] = values
+    return lookup
+
+
+class SolutionMatrix(NamedTuple):
+    """
+    Dense (n_objects, n_periods) view of the values of one property.
+    """
+
+    values: np.ndarray
+    objects: list[str]
+    datetimes: np.ndarray
+
+
+def get_matrix(
+    t_data: pa.Table,
+    entries: list[KeyEntry],
+    key_ids: list[int],
+    periods: tuple[int, int] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Arrange the runs of several keys of the same period type as rows of a matrix.
+
+    When every run has the same length and period offset and the runs are stored one after
+    the other, the matrix is a reshaped view of the value column. Otherwise the matrix spans
+    every period of the runs and periods without a value are NaN. With `periods` only the
+    columns inside the period interval are kept, a column slice of the view or a gather of
+    the values of those periods alone.
+
+    Args:
+        t_data (pa.Table): t_data table of the keys period type.
+        entries (list[KeyEntry]): index entries of the keys, one per row.
+        key_ids (list[int]): key of every entry.
+        periods (tuple[int, int] | None, optional): first and last period_id to read, both
+            included. Defaults to every period.
+
+    Raises:
+        ValueError: If the t_data table is not in t_key_index order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the matrix and the period id of every column.
+    """
+    if not entries:
+        return np.empty((0, 0)), np.empty(0, dtype=np.int64)
+
+    row_start = np.array([entry.row_start for entry in entries], dtype=np.int64)
+    length = np.array([entry.length for entry in entries], dtype=np.int64)
+
+    stored = length > 0
+    first_key_ids = t_data.column("key_id").take(pa.array(row_start[stored]))
+    if first_key_ids.to_pylist() != np.array(key_ids)[stored].tolist():
+        raise ValueError(
+            f"t_data_{entries[0].period_type_id} is not aligned with t_key_index"
+        )
+
+    period_offset = np.array([entry.period_offset for entry in entries], dtype=np.int64)
+
+    first_period = int(period_offset.min()) + 1
+    last_period = int((period_offset + length).max())
+    if periods is not None:
+        first_period = max(first_period, periods[0])
+        last_period = min(last_period, periods[1])
+    period_ids = np.arange(first_period, last_period + 1)
+
+    same_shape = bool(
+        np.all(length == length[0]) and np.all(period_offset == period_offset[0])
+    )
+    stored_in_order = bool(np.array_equal(row_start[1:], row_start[:-1] + length[:-1]))
+
+    if same_shape and stored_in_order:
+        values = column_to_numpy(
+            t_data.slice(int(row_start[0]), int(length.sum())).column("value")
+        ).reshape(len(entries), int(length[0]))
+        start = first_period - int(period_offset[0]) - 1
+        return values[:, start : start + len(period_ids)], period_ids
+
+    # sub-range of every run inside [first_period, last_period]
+    start = np.clip(first_period - period_offset - 1, 0, length)
+    count = np.maximum(np.clip(last_period - period_offset, 0, length) - start, 0)
+
+    total = int(count.sum())
+    run_index = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+    run_index += np.repeat(start, count)
+    rows = np.repeat(np.arange(len(entries)), count)
+    columns = run_index + np.repeat(period_offset + 1 - first_period, count)
+
+    matrix = np.full((len(entries), len(period_ids)), np.nan)
+    matrix[rows, columns] = column_to_numpy(
+        t_data.column("value").take(pa.array(run_index + np.repeat(row_start, count)))
+    )
+    return matrix, period_ids
+
+
+def column_to_numpy(column: pa.ChunkedArray) -> np.ndarray:
+    """Numpy view of a float column, only copied when it spans several chunks.
+
+    Args:
+        column (pa.ChunkedArray): column without nulls.
+
+    Returns:
+        np.ndarray: column values.
+    """
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy()
+    return column.to_numpy()
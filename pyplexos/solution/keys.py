@@ -0,0 +1,171 @@
+from enum import Enum
+from typing import Iterable
+
+import polars as pl
+import pyarrow as pa
+
+# name columns of the key dimension, kept as Categorical
+NAME_COLUMNS: list[str] = [
+    "collection_name",
+    "category_name",
+    "parent_name",
+    "child_name",
+    "property_name",
+]
+
+
+def get_dim_key(
+    t_key: pa.Table | pl.LazyFrame,
+    t_membership: pa.Table | pl.LazyFrame,
+    t_collection: pa.Table | pl.LazyFrame,
+    t_object: pa.Table | pl.LazyFrame,
+    t_property: pa.Table | pl.LazyFrame,
+    t_category: pa.Table | pl.LazyFrame,
+) -> pl.LazyFrame:
+    """Build the key dimension: one row per key with the names of its collection, property,
+    parent and child objects and the category of the child object, as Categorical columns.
+
+    Args:
+        t_key (pa.Table | pl.LazyFrame): t_key table.
+        t_membership (pa.Table | pl.LazyFrame): t_membership table.
+        t_collection (pa.Table | pl.LazyFrame): t_collection table.
+        t_object (pa.Table | pl.LazyFrame): t_object table.
+        t_property (pa.Table | pl.LazyFrame): t_property table.
+        t_category (pa.Table | pl.LazyFrame): t_category table.
+
+    Returns:
+        pl.LazyFrame: key dimension.
+    """
+    key = as_lazy(t_key)
+    membership = as_lazy(t_membership)
+    collection = as_lazy(t_collection)
+    objects = as_lazy(t_object)
+    properties = as_lazy(t_property)
+    category = as_lazy(t_category)
+
+    return (
+        key.select(
+            pl.col("key_id"),
+            pl.col("membership_id"),
+            pl.col("property_id"),
+            pl.col("model_id"),
+            pl.col("phase_id"),
+            pl.col("period_type_id"),
+            pl.col("band_id"),
+            pl.col("sample_id"),
+            pl.col("timeslice_id"),
+        )
+        .join(
+            membership.select(
+                pl.col("membership_id"),
+                pl.col("collection_id"),
+                pl.col("parent_object_id"),
+                pl.col("child_object_id"),
+            ),
+            on="membership_id",
+            how="inner",
+        )
+        .join(
+            collection.select(
+                pl.col("collection_id"),
+                pl.col("name").alias("collection_name"),
+            ),
+            on="collection_id",
+            how="inner",
+        )
+        .join(
+            objects.select(
+                pl.col("object_id").alias("parent_object_id"),
+                pl.col("name").alias("parent_name"),
+            ),
+            on="parent_object_id",
+            how="inner",
+        )
+        .join(
+            objects.select(
+                pl.col("object_id").alias("child_object_id"),
+                pl.col("name").alias("child_name"),
+                pl.col("category_id"),
+            ),
+            on="child_object_id",
+            how="inner",
+        )
+        .join(
+            properties.select(
+                pl.col("property_id"),
+                pl.col("name").alias("property_name"),
+            ),
+            on="property_id",
+            how="inner",
+        )
+        .join(
+            category.select(
+                pl.col("category_id"),
+                pl.col("name").alias("category_name"),
+            ),
+            on="category_id",
+            how="left",
+        )
+        # names repeat on every row of a query, strings read from an accdb are encoded too
+        .with_columns(pl.col(NAME_COLUMNS).cast(pl.Categorical))
+    )
+
+
+def as_lazy(table: pa.Table | pl.LazyFrame) -> pl.LazyFrame:
+    """Polars view of a table, arrow tables are converted (and rechunked) here."""
+    if isinstance(table, pl.LazyFrame):
+        return table
+    data: pl.DataFrame = pl.from_arrow(table)  # type: ignore
+    return data.lazy()
+
+
+def filter_dim_key(
+    dim_key: pl.LazyFrame,
+    collections: Iterable[int | str] | None = None,
+    properties: Iterable[Enum | str] | None = None,
+    objects: Iterable[str] | None = None,
+) -> pl.LazyFrame:
+    """Filter the key dimension, filters left as None select everything.
+
+    Args:
+        dim_key (pl.LazyFrame): key dimension from `get_dim_key`.
+        collections (Iterable[int | str] | None, optional): collection ids or names.
+        properties (Iterable[Enum | str] | None, optional): QuerySchema properties, matched by
+            collection and property name, or property names of any collection.
+        objects (Iterable[str] | None, optional): child object names.
+
+    Returns:
+        pl.LazyFrame: keys matching every filter.
+    """
+    predicates: list[pl.Expr] = []
+
+    if collections is not None:
+        collections = list(collections)
+        predicates.append(
+            pl.col("collection_id").is_in(
+                [value for value in collections if isinstance(value, int)]
+            )
+            | pl.col("collection_name").is_in(
+                [value for value in collections if isinstance(value, str)]
+            )
+        )
+
+    if properties is not None:
+        property_predicate = pl.lit(False)
+        for value in properties:
+            if isinstance(value, Enum):
+                collection_id, _, property_name = value.value
+                property_predicate |= pl.col("collection_id").eq(
+                    collection_id
+                ) & pl.col("property_name").eq(property_name)
+            else:
+                property_predicate |= pl.col("property_name").eq(value)
+        predicates.append(property_predicate)
+
+    if objects is not None:
+        predicates.append(pl.col("child_name").is_in(list(objects)))
+
+    if not predicates:
+        return dim_key
+
+    return dim_key.filter(*predicates)
@@ -0,0 +1,239 @@
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Iterator, Protocol, Self
+from zipfile import ZipFile
+
+import pyarrow as pa
+
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.accdb import create_accdb_engine, get_data
+from pyplexos.solution.cache import QueryCache
+from pyplexos.solution.zip import (
+    decode_solution_bin,
+    find_solution_files,
+    read_solution_bin,
+    read_solution_xml,
+)
+from pyplexos.solution.zip.bin import DATA_SCHEMA
+
+
+class SolutionSource(Protocol):
+    def read_tables(
+        self, table_names: set[str], t_key_index: pa.Table | None = None
+    ) -> dict[str, pa.Table]: ...
+
+    def read_binary(self, period_type_id: int) -> bytes | memoryview | None: ...
+
+
+@dataclass
+class ZipSource:
+    """
+    Solution zip file read table by table. Every call parses the XML once for all the requested
+    XML tables, the rows of the other tables are skipped, and decodes the requested t_data
+    tables from their BIN files. The BIN files are read once and kept, `PlexosSolution.series`
+    reads single keys from them.
+    """
+
+    path: Path
+    memory_map: bool = False
+    extract_dir: str | None = None
+    validate: bool | float = False
+    binaries: dict[int, bytes | memoryview] = field(default_factory=dict, repr=False)
+
+    def read_tables(
+        self, table_names: set[str], t_key_index: pa.Table | None = None
+    ) -> dict[str, pa.Table]:
+        """Read some tables of the solution.
+
+        Args:
+            table_names (set[str]): tables to read.
+            t_key_index (pa.Table | None, optional): key index already read, used to decode
+                the t_data tables without parsing the XML again.
+
+        Returns:
+            dict[str, pa.Table]: the requested tables, plus t_key_index when it was parsed to
+                decode them.
+        """
+        data_names = {name for name in table_names if name.startswith("t_data_")}
+        xml_names = table_names - data_names
+        if data_names and t_key_index is None:
+            xml_names.add("t_key_index")
+
+        tables: dict[str, pa.Table] = {}
+        if xml_names:
+            with ZipFile(self.path, "r") as zip_ref:
+                xml_file_name, _ = find_solution_files(zip_ref)
+                with zip_ref.open(xml_file_name) as xml_file:
+                    xml_tables = read_solution_xml(
+                        xml_file, validate=self.validate, tables=xml_names
+                    )
+            tables = {name: xml_tables[name] for name in xml_names}
+
+        t_key_index = tables.get("t_key_index", t_key_index)
+        for table_name in data_names:
+            period_type_id = int(table_name.removeprefix("t_data_"))
+            binary_data = self.read_binary(period_type_id)
+            if binary_data is None:
+                tables[table_name] = DATA_SCHEMA.empty_table()
+                continue
+            tables[table_name] = decode_solution_bin(
+                t_key_index, period_type_id, binary_data
+            )
+        return tables
+
+    def read_binary(self, period_type_id: int) -> bytes | memoryview | None:
+        """Read the t_data_N.BIN file of a period type, memory-mapped with `memory_map`. The
+        data is kept, later calls return the same buffer.
+
+        Args:
+            period_type_id (int): period type of the BIN file.
+
+        Returns:
+            bytes | memoryview | None: the binary data, None if the zip file has no BIN file
+                for the period type.
+        """
+        if period_type_id not in self.binaries:
+            with ZipFile(self.path, "r") as zip_ref:
+                _, bin_file_names = find_solution_files(zip_ref)
+            if period_type_id not in bin_file_names:
+                return None
+            self.binaries[period_type_id] = read_solution_bin(
+                self.path,
+                bin_file_names[period_type_id],
+                memory_map=self.memory_map,
+                extract_dir=self.extract_dir,
+            )
+        return self.binaries[period_type_id]
+
+
+@dataclass
+class AccdbSource:
+    """
+    Solution access database read table by table. Only t_data_0 is stored in the database,
+    the other t_data tables are empty, like in `PlexosSolution.from_accdb`.
+    """
+
+    path: Path
+
+    def read_tables(
+        self, table_names: set[str], t_key_index: pa.Table | None = None
+    ) -> dict[str, pa.Table]:
+        accdb_engine = create_accdb_engine(self.path)
+
+        with accdb_engine.connect() as conn:
+            return {
+                table_name: (
+                    DATA_SCHEMA.empty_table()
+                    if table_name.startswith("t_data_") and table_name != "t_data_0"
+                    else get_data(table_name, conn)
+                )
+                for table_name in table_names
+            }
+
+    def read_binary(self, period_type_id: int) -> bytes | memoryview | None:
+        """The values are stored in the database, there is no BIN file."""
+        return None
+
+
+class LazyTable:
+    """
+    Table attribute of a LazyPlexosSolution, read from the source of the solution on first
+    access and kept in the instance afterwards.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: "LazyPlexosSolution | None", owner: type | None = None):
+        if instance is None:
+            return self
+        instance.materialize(self.name)
+        return instance.__dict__[self.name]
+
+
+class LazyPlexosSolution(PlexosSolution):
+    """
+    PlexosSolution that reads its tables on demand. Every t_* attribute is read from the zip
+    file or access database the first time it is accessed, the queries read the tables they
+    need in a single pass, see `PlexosSolution.materialize`. `items`, `to_parquet` and
+    `to_duck` read every table.
+
+    A session that only queries prices parses the key, key index, period and phase tables of
+    the XML and decodes t_data_0, the rest of the XML is skipped.
+    """
+
+    def __init__(self, source: SolutionSource) -> None:
+        self.source = source
+        self.query_cache = QueryCache()
+
+    def __repr__(self) -> str:
+        loaded = [field.name for field in fields(self) if field.name in self.__dict__]
+        return f"{type(self).__name__}(source={self.source!r}, loaded={loaded})"
+
+    @classmethod
+    def from_zip(
+        cls,
+        zip_file_path: str,
+        memory_map: bool = False,
+        extract_dir: str | None = None,
+        validate: bool | float = False,
+    ) -> Self:
+        """Open a solution zip file without reading any table.
+
+        Args:
+            zip_file_path (str): path to the solution zip file.
+            memory_map (bool, optional): memory-map the binary data, see
+                `PlexosSolution.from_zip`. Defaults to False.
+            extract_dir (str | None, optional): folder where compressed binary files are
+                extracted for memory mapping. Defaults to the system temp folder.
+            validate (bool | float, optional): validate the XML rows, see
+                `PlexosSolution.from_zip`. Defaults to False.
+
+        Returns:
+            LazyPlexosSolution: the solution, its tables are read on first access.
+        """
+        path = Path(zip_file_path)
+
+        if not path.exists():
+            raise FileNotFoundError(f"Path does not exists: {zip_file_path}")
+
+        return cls(ZipSource(path, memory_map, extract_dir, validate))
+
+    @classmethod
+    def from_accdb(cls, accdb_file_path: str) -> Self:
+        path = Path(accdb_file_path)
+
+        if not path.exists():
+            raise FileNotFoundError(f"Path does not exists: {accdb_file_path}")
+
+        return cls(AccdbSource(path))
+
+    def materialize(self, *table_names: str) -> Self:
+        """Read the tables not read yet, all in one pass over the source. Called by the
+        queries and cached dimensions of PlexosSolution with the tables they need.
+
+        Args:
+            *table_names (str): tables to read, e.g. "t_object", "t_data_1".
+
+        Returns:
+            LazyPlexosSolution: the solution itself.
+        """
+        missing = {name for name in table_names if name not in self.__dict__}
+        if missing:
+            tables = self.source.read_tables(
+                missing, t_key_index=self.__dict__.get("t_key_index")
+            )
+            for table_name, table in tables.items():
+                self.__dict__.setdefault(table_name, table)
+        return self
+
+    def binary_data(self, period_type_id: int) -> bytes | memoryview | None:
+        return self.source.read_binary(period_type_id)
+
+    def items(self) -> Iterator[tuple[str, pa.Table]]:
+        self.materialize(*(field.name for field in fields(self)))
+        return super().items()
+
+
+for solution_field in fields(PlexosSolution):
+    setattr(LazyPlexosSolution, solution_field.name, LazyTable(solution_field.name))
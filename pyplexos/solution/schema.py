@@ -38,9 +38,17 @@ class SolutionSchema(Enum):
     t_memo_object = "t_memo_object"
     t_object_meta = "t_object_meta"
     t_data_0 = "t_data_0"
+    t_data_1 = "t_data_1"
+    t_data_2 = "t_data_2"
+    t_data_3 = "t_data_3"
+    t_data_4 = "t_data_4"
+    t_data_6 = "t_data_6"
+    t_data_7 = "t_data_7"
 
 class SolutionProtocol(Protocol):
-    def items(self) -> Generator[tuple[str, pa.Table], None, None]:
+    def items(
+        self,
+    ) -> Generator[tuple[str, pa.Table | pa.RecordBatchReader], None, None]:
         ...
 
 class GeneratorProperty(Enum):
@@ -1,60 +1,507 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import IO, Callable, Iterable, Iterator
 from zipfile import ZipFile
 
-from pyplexos.solution.zip.xml import SolutionModel
-from pyplexos.solution.zip.bin import SolutionData
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
 
+from pyplexos.solution.keys import filter_dim_key, get_dim_key
+from pyplexos.solution.schema import SolutionSchema
+from pyplexos.solution.zip.xml import SOLUTION_SCHEMAS, SolutionModel
+from pyplexos.solution.zip.bin import (
+    DATA_SCHEMA,
+    DataTable,
+    SolutionData,
+    iter_data_batches,
+)
+from pyplexos.solution.zip.member import map_zip_member
+from pyplexos.utils.arrow import tables_from_model
 
-def extract_zip_data(path: Path) -> dict[str, Any]:
+logger = logging.getLogger(__name__)
+
+# tables the key filters are resolved against, see get_dim_key
+KEY_TABLES: tuple[str, ...] = (
+    "t_key",
+    "t_membership",
+    "t_collection",
+    "t_object",
+    "t_property",
+    "t_category",
+)
+
+
+def extract_zip_data(
+    path: Path,
+    memory_map: bool = False,
+    extract_dir: str | Path | None = None,
+    collections: Iterable[int | str] | None = None,
+    properties: Iterable[Enum | str] | None = None,
+    objects: Iterable[str] | None = None,
+    batch_rows: int | None = None,
+    validate: bool | float = False,
+    tables: Iterable[str] | None = None,
+    timings: dict[str, float] | None = None,
+) -> dict[str, pa.Table | pa.RecordBatchReader]:
     """
     Extracts and parses data from the specified ZIP file path. This function looks for specific XML and binary
     files within the ZIP archive, parses them, and consolidates the data into a dictionary.
 
     Parameters:
     - path (Path): A pathlib.Path object pointing to the ZIP file to be processed.
+    - memory_map (bool): Memory-map the binary files instead of reading them into memory. Stored
+      members are mapped from the archive, compressed ones are extracted once to `extract_dir`.
+    - extract_dir (str | Path | None): Folder for extracted binary files when memory mapping.
+    - collections (Iterable[int | str] | None): Only decode keys of these collection ids or names.
+    - properties (Iterable[Enum | str] | None): Only decode keys of these QuerySchema properties
+      or property names.
+    - objects (Iterable[str] | None): Only decode keys of these child objects.
+    - batch_rows (int | None): Stream the binary tables as RecordBatchReaders of at most this many
+      rows instead of decoding them, see `iter_solution_batches`.
+    - validate (bool | float): Validate every XML row with the SolutionModel table models
+      instead of streaming the XML straight into columns, or a fraction of the rows while
+      streaming, see `read_solution_xml`.
+    - tables (Iterable[str] | None): Only read these tables, plus the tables they need (see
+      `resolve_tables`). The other tables are returned empty and their BIN files are not read.
+    - timings (dict[str, float] | None): Filled with the seconds spent in every stage: "xml",
+      "read_bin", "decode" and "total". Stages overlap, so they can add up to more than
+      "total". The timings are also logged at DEBUG level.
 
     Returns:
-    - dict[str, Any]: A dictionary containing the parsed data from the XML and binary files.
-      This includes model and solution data structured according to their respective schemas.
+    - dict[str, pa.Table | pa.RecordBatchReader]: A dictionary containing the parsed tables from the
+      XML and binary files. The value column of the binary tables shares memory with the binary data.
+      When filtering, t_key_index only keeps the decoded keys.
 
     Raises:
+    - ValueError: If `tables` names a table that is not part of a solution.
     - XMLFileError: If the required XML file is not found in the ZIP archive.
     - BinFileError: If the required binary data file (t_data_0.BIN) is not found in the ZIP archive.
 
     The function first identifies the XML and binary files required for the solution data.
     If either file is missing, it raises an error. After successfully locating the files, it reads and
     parses the XML to a solution model and the binary data to solution data, which are then merged into
-    a single dictionary that gets returned.
+    a single dictionary that gets returned. Filters are resolved against the XML tables first, so only
+    the byte ranges of the matching keys are read from the binary files. Every t_data_N.BIN file
+    present (one per period type) is decoded, the t_data tables without a binary file are empty.
+
+    The stages are pipelined: the BIN files are read (decompressed or mapped) in worker threads
+    while the XML is parsed, and they are decoded as soon as t_key_index has been parsed, before
+    the rest of the XML. zlib and NumPy release the GIL, so the stages run in parallel. With key
+    filters the decode waits for the whole XML, the filters need the key tables.
     """
-    xml_file_name: str = ""
-    bin_file_name: str = ""
-
-    # get the xml and bin files names
-    with ZipFile(path, "r") as zip_ref:
-        for file_name in zip_ref.namelist():
-            if file_name.startswith("Model") and file_name.endswith(".xml"):
-                xml_file_name = file_name
-            if file_name == "t_data_0.BIN":
-                bin_file_name = file_name
-
-        # check if the files were found or raise error.
-        if xml_file_name == "":
-            raise FileNotFoundError("no existe archivo .xml")
-        if bin_file_name == "":
-            raise FileNotFoundError("no existe archivo .bin")
-
-        # Open XML
-        with zip_ref.open(xml_file_name) as xml_file:
-            solution_model = SolutionModel.from_xml(xml_file)
-
-        # Open BIN
+    filtered = collections is not None or properties is not None or objects is not None
+    selected = resolve_tables(tables, filtered=filtered) if tables is not None else None
+    stage_timings = StageTimings(timings)
+
+    with stage_timings.measure("total"), ZipFile(path, "r") as zip_ref:
+        xml_file_name, bin_file_names = find_solution_files(zip_ref)
+
+        if selected is not None:
+            bin_file_names = {
+                period_type_id: bin_file_name
+                for period_type_id, bin_file_name in bin_file_names.items()
+                if f"t_data_{period_type_id}" in selected
+            }
+
+        if batch_rows is not None:
+            with zip_ref.open(xml_file_name) as xml_file:
+                tables = read_solution_xml(xml_file, validate=validate, tables=selected)
+
+            if filtered:
+                tables["t_key_index"] = filter_key_index(
+                    tables, collections=collections, properties=properties, objects=objects
+                )
+
+            data_tables: dict[str, pa.Table | pa.RecordBatchReader] = {
+                table_name: DATA_SCHEMA.empty_table()
+                for table_name in SolutionData.model_fields
+            }
+            for period_type_id in bin_file_names:
+                data_tables[f"t_data_{period_type_id}"] = solution_batch_reader(
+                    path,
+                    batch_rows=batch_rows,
+                    period_type_id=period_type_id,
+                    t_key_index=tables["t_key_index"],
+                )
+            return tables | data_tables
+
+        with ThreadPoolExecutor() as executor:
+            # reads are queued first, so decodes never wait on a read without a worker
+            binary_futures = {
+                period_type_id: executor.submit(
+                    read_solution_bin,
+                    path,
+                    bin_file_name,
+                    memory_map=memory_map,
+                    extract_dir=extract_dir,
+                    stage_timings=stage_timings,
+                )
+                for period_type_id, bin_file_name in bin_file_names.items()
+            }
+            data_futures: dict[int, Future[pa.Table]] = {}
+            decoded_key_index: pa.Table | None = None
+
+            def decode(t_key_index: pa.Table) -> None:
+                nonlocal decoded_key_index
+                decoded_key_index = t_key_index
+                for period_type_id, binary_future in binary_futures.items():
+                    data_futures[period_type_id] = executor.submit(
+                        decode_solution_bin,
+                        t_key_index,
+                        period_type_id,
+                        binary_future,
+                        stage_timings=stage_timings,
+                    )
+
+            def on_table(table_name: str, table: pa.Table) -> None:
+                if table_name == "t_key_index" and not filtered:
+                    decode(table)
+
+            with stage_timings.measure("xml"), zip_ref.open(xml_file_name) as xml_file:
+                tables = read_solution_xml(
+                    xml_file, validate=validate, tables=selected, on_table=on_table
+                )
+
+            if filtered:
+                tables["t_key_index"] = filter_key_index(
+                    tables, collections=collections, properties=properties, objects=objects
+                )
+
+            # filtered keys, or t_key_index rows found after the first run of the table
+            if decoded_key_index is None or not decoded_key_index.equals(
+                tables["t_key_index"]
+            ):
+                decode(tables["t_key_index"])
+
+            data_tables = {
+                table_name: DATA_SCHEMA.empty_table()
+                for table_name in SolutionData.model_fields
+            }
+            for period_type_id, data_future in data_futures.items():
+                data_tables[f"t_data_{period_type_id}"] = data_future.result()
+
+    stage_timings.log(path)
+    return tables | data_tables
+
+
+class StageTimings:
+    """
+    Thread-safe accumulator of the seconds spent in every stage of `extract_zip_data`.
+    """
+
+    def __init__(self, timings: dict[str, float] | None = None) -> None:
+        self.timings = timings if timings is not None else {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
+    def log(self, path: Path) -> None:
+        logger.debug(
+            "%s: %s",
+            path.name,
+            ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in self.timings.items()),
+        )
+
+
+def read_solution_bin(
+    path: Path,
+    bin_file_name: str,
+    memory_map: bool = False,
+    extract_dir: str | Path | None = None,
+    stage_timings: StageTimings | None = None,
+) -> bytes | memoryview:
+    """
+    Read a t_data_N.BIN file of a solution ZIP file. Every call opens its own handle of the
+    archive, so several files can be read from worker threads at once.
+
+    Parameters:
+    - path (Path): Path to the solution ZIP file.
+    - bin_file_name (str): Name of the BIN member.
+    - memory_map (bool): Memory-map the member instead of reading it, see `map_zip_member`.
+    - extract_dir (str | Path | None): Folder for extracted members when memory mapping.
+    - stage_timings (StageTimings | None): Accumulator of the "read_bin" time.
+
+    Returns:
+    - bytes | memoryview: The binary data of the member.
+    """
+    stage_timings = stage_timings or StageTimings()
+    with stage_timings.measure("read_bin"), ZipFile(path, "r") as zip_ref:
+        if memory_map:
+            return map_zip_member(zip_ref, bin_file_name, extract_dir)
         with zip_ref.open(bin_file_name) as bin_file:
-            binary_data = bin_file.read()
-            solution_data = SolutionData.from_binary(
-                solution_model.t_key_index, binary_data
-            )
+            return bin_file.read()
+
+
+def decode_solution_bin(
+    t_key_index: pa.Table,
+    period_type_id: int,
+    binary_data: bytes | memoryview | Future[bytes | memoryview],
+    stage_timings: StageTimings | None = None,
+) -> pa.Table:
+    """
+    Decode the keys of a period type from its t_data_N.BIN data.
+
+    Parameters:
+    - t_key_index (pa.Table): Key index of every period type.
+    - period_type_id (int): Period type of the binary data.
+    - binary_data (bytes | memoryview | Future): The binary data, or the future of a
+      `read_solution_bin` call that is waited for.
+    - stage_timings (StageTimings | None): Accumulator of the "decode" time.
+
+    Returns:
+    - pa.Table: The t_data_N table.
+    """
+    if isinstance(binary_data, Future):
+        binary_data = binary_data.result()
+
+    stage_timings = stage_timings or StageTimings()
+    with stage_timings.measure("decode"):
+        return DataTable.from_key_index(
+            t_key_index.filter(
+                pc.equal(t_key_index.column("period_type_id"), period_type_id)
+            ),
+            binary_data,
+        ).to_arrow()
+
+
+def iter_solution_batches(
+    zip_path: str | Path,
+    batch_rows: int = 1_000_000,
+    period_type_id: int = 0,
+    t_key_index: pa.Table | None = None,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Stream a t_data table of a solution ZIP file as record batches without materializing it.
+
+    Only the key positions of t_key_index are needed, the binary member is decompressed while
+    it is read and at most `batch_rows` values are held in memory at once. Keys are yielded in
+    binary position order.
+
+    Parameters:
+    - zip_path (str | Path): Path to the solution ZIP file.
+    - batch_rows (int): Maximum number of rows of every batch.
+    - period_type_id (int): Period type of the t_data_N.BIN file to read.
+    - t_key_index (pa.Table | None): Key index to read, e.g. a filtered one. Defaults to the
+      t_key_index of the solution XML.
+
+    Yields:
+    - pa.RecordBatch: Batches with the key_id, period_id and value columns.
+
+    Raises:
+    - FileNotFoundError: If the XML or the t_data_N.BIN file is not in the ZIP archive.
+    """
+    with ZipFile(zip_path, "r") as zip_ref:
+        xml_file_name, bin_file_names = find_solution_files(zip_ref)
+
+        if period_type_id not in bin_file_names:
+            raise FileNotFoundError(f"no existe archivo t_data_{period_type_id}.BIN")
+
+        if t_key_index is None:
+            with zip_ref.open(xml_file_name) as xml_file:
+                t_key_index = read_solution_xml(xml_file, tables=["t_key_index"])[
+                    "t_key_index"
+                ]
 
-    return solution_model.model_dump(by_alias=True) | solution_data.model_dump(
-        by_alias=True
+        t_key_index = t_key_index.filter(
+            pc.equal(t_key_index.column("period_type_id"), period_type_id)
+        )
+
+        with zip_ref.open(bin_file_names[period_type_id]) as bin_file:
+            yield from iter_data_batches(bin_file, t_key_index, batch_rows)
+
+
+def solution_batch_reader(
+    zip_path: str | Path,
+    batch_rows: int = 1_000_000,
+    period_type_id: int = 0,
+    t_key_index: pa.Table | None = None,
+) -> pa.RecordBatchReader:
+    """
+    Wrap `iter_solution_batches` in a RecordBatchReader, which DuckDB and the Parquet writer
+    consume batch by batch. The reader can only be consumed once.
+
+    Parameters:
+    - zip_path (str | Path): Path to the solution ZIP file.
+    - batch_rows (int): Maximum number of rows of every batch.
+    - period_type_id (int): Period type of the t_data_N.BIN file to read.
+    - t_key_index (pa.Table | None): Key index to read, defaults to the one of the solution XML.
+
+    Returns:
+    - pa.RecordBatchReader: Reader of the t_data table.
+    """
+    return pa.RecordBatchReader.from_batches(
+        DATA_SCHEMA,
+        iter_solution_batches(
+            zip_path,
+            batch_rows=batch_rows,
+            period_type_id=period_type_id,
+            t_key_index=t_key_index,
+        ),
+    )
+
+
+def find_solution_files(zip_ref: ZipFile) -> tuple[str, dict[int, str]]:
+    """
+    Find the solution XML file and the t_data_N.BIN files inside a solution ZIP archive.
+
+    Parameters:
+    - zip_ref (ZipFile): Open solution ZIP archive.
+
+    Returns:
+    - tuple[str, dict[int, str]]: XML file name and the BIN file name of every period type id.
+
+    Raises:
+    - FileNotFoundError: If the XML file or the t_data_0.BIN file is missing.
+    """
+    xml_file_name: str = ""
+    bin_file_names: dict[int, str] = {}
+    data_tables = {
+        f"{table_name}.BIN": table_name for table_name in SolutionData.model_fields
+    }
+
+    for file_name in zip_ref.namelist():
+        if file_name.startswith("Model") and file_name.endswith(".xml"):
+            xml_file_name = file_name
+        if file_name in data_tables:
+            period_type_id = int(data_tables[file_name].removeprefix("t_data_"))
+            bin_file_names[period_type_id] = file_name
+
+    # check if the files were found or raise error.
+    if xml_file_name == "":
+        raise FileNotFoundError("no existe archivo .xml")
+    if 0 not in bin_file_names:
+        raise FileNotFoundError("no existe archivo .bin")
+
+    return xml_file_name, bin_file_names
+
+
+def read_solution_xml(
+    xml_file: IO[bytes],
+    validate: bool | float = False,
+    tables: Iterable[str] | None = None,
+    on_table: Callable[[str, pa.Table], None] | None = None,
+) -> dict[str, pa.Table]:
+    """
+    Parse the solution XML file into Arrow tables.
+
+    Parameters:
+    - xml_file (IO[bytes]): Open solution XML file.
+    - validate (bool | float): True builds and validates a SolutionModel row by row instead of
+      streaming the XML into columns. Slower, meant to check files from unknown PLEXOS
+      versions, every table is parsed and validated and `tables` only selects the ones
+      returned. A fraction, e.g. 0.01, streams the XML and validates that share of the rows
+      of every table to catch format changes.
+    - tables (Iterable[str] | None): Only parse these tables, the rows of the others are
+      skipped by the parser. Dependencies are not added, see `resolve_tables`.
+    - on_table (Callable[[str, pa.Table], None] | None): Called with every table as soon as it
+      has been parsed, see `read_xml_tables`. Not called when validating.
+
+    Returns:
+    - dict[str, pa.Table]: Every XML table by name, typed with SOLUTION_SCHEMAS. Tables missing
+      from the file or not selected are empty.
+    """
+    selected = set(tables) if tables is not None else set(SOLUTION_SCHEMAS)
+
+    if validate is not True:
+        xml_tables = SolutionModel.tables_from_xml(
+            xml_file, tables=selected, on_table=on_table, validate=validate
+        )
+    else:
+        xml_tables = tables_from_model(
+            SolutionModel.from_xml(xml_file),
+            {
+                table_name: schema
+                for table_name, schema in SOLUTION_SCHEMAS.items()
+                if table_name in selected
+            },
+        )
+
+    return {
+        table_name: xml_tables.get(table_name, schema.empty_table())
+        for table_name, schema in SOLUTION_SCHEMAS.items()
+    }
+
+
+def resolve_tables(tables: Iterable[str], filtered: bool = False) -> set[str]:
+    """
+    Add to a selection of solution tables the tables needed to read them.
+
+    Parameters:
+    - tables (Iterable[str]): Names of the requested tables, e.g. ["t_data_0", "t_object"].
+    - filtered (bool): Keys are filtered by collection, property or object, which needs the
+      KEY_TABLES to resolve the keys.
+
+    Returns:
+    - set[str]: The requested tables and their dependencies. t_data_N tables need t_key_index
+      to decode their BIN file and the filters are applied to t_key_index.
+
+    Raises:
+    - ValueError: If a table is not part of a solution.
+    """
+    selected = set(tables)
+
+    unknown = selected - {table.value for table in SolutionSchema}
+    if unknown:
+        raise ValueError(f"unknown solution tables: {sorted(unknown)}")
+
+    if filtered or any(table_name.startswith("t_data_") for table_name in selected):
+        selected.add("t_key_index")
+    if filtered:
+        selected.update(KEY_TABLES)
+
+    return selected
+
+
+def filter_key_index(
+    tables: dict[str, pa.Table],
+    collections: Iterable[int | str] | None = None,
+    properties: Iterable[Enum | str] | None = None,
+    objects: Iterable[str] | None = None,
+) -> pa.Table:
+    """Keep the t_key_index rows of the keys matching the filters.
+
+    Args:
+        tables (dict[str, pa.Table]): solution XML tables.
+        collections (Iterable[int | str] | None, optional): collection ids or names.
+        properties (Iterable[Enum | str] | None, optional): QuerySchema properties or names.
+        objects (Iterable[str] | None, optional): child object names.
+
+    Returns:
+        pa.Table: filtered t_key_index, in its original order.
+    """
+    key_ids: pl.Series = (
+        filter_dim_key(
+            get_dim_key(
+                t_key=tables["t_key"],
+                t_membership=tables["t_membership"],
+                t_collection=tables["t_collection"],
+                t_object=tables["t_object"],
+                t_property=tables["t_property"],
+                t_category=tables["t_category"],
+            ),
+            collections=collections,
+            properties=properties,
+            objects=objects,
+        )
+        .select("key_id")
+        .collect()
+        .to_series()
+    )
+    t_key_index = tables["t_key_index"]
+    return t_key_index.filter(
+        pc.is_in(t_key_index.column("key_id"), key_ids.to_arrow())
     )
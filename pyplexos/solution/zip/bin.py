@@ -1,18 +1,74 @@
-from pydantic import BaseModel
-from typing import Optional, Self
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from numpy.typing import ArrayLike
+from pydantic import BaseModel, ConfigDict
+from typing import IO, Iterator, Optional, Self
 from struct import unpack
 
-from pyplexos.solution.zip.xml import KeyIndexTable
+from pyplexos.solution.zip.xml import SOLUTION_SCHEMAS, KeyIndexTable
+
+
+DATA_SCHEMA = pa.schema(
+    [
+        pa.field("key_id", pa.int32()),
+        pa.field("period_id", pa.int32()),
+        pa.field("value", pa.float64()),
+    ]
+)
 
 
 class DataTable(BaseModel):
-    key_id: list[int]
-    period_id: list[int]
-    value: list[float]
+    """
+    Class to represent the tables: t_data_*
+    columns are kept as contiguous numpy arrays so they can be handed to Arrow without copies.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    key_id: np.ndarray
+    period_id: np.ndarray
+    value: np.ndarray
+
+    @classmethod
+    def from_key_index(
+        cls, t_key_index: pa.Table, binary_data: bytes | memoryview
+    ) -> Self:
+        """
+        Decode the keys of t_key_index from the binary file they point to.
+
+        Args:
+            t_key_index (pa.Table): t_key_index rows of a single period type.
+            binary_data (bytes | memoryview): The binary data to read, it can be a memory map.
+
+        Returns:
+            DataTable: The decoded t_data table.
+        """
+        key_id, period_id, value = decode_key_index(
+            key_id=t_key_index.column("key_id").to_numpy(),
+            position=t_key_index.column("position").to_numpy(),
+            length=t_key_index.column("length").to_numpy(),
+            period_offset=t_key_index.column("period_offset").to_numpy(),
+            binary_data=binary_data,
+        )
+        return cls(key_id=key_id, period_id=period_id, value=value)
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Wrap the columns in an Arrow table. Numeric numpy arrays are shared with Arrow, so when
+        `value` is a view over the binary data no element is copied.
+
+        Returns:
+            pa.Table: The t_data table with key_id, period_id and value columns.
+        """
+        return pa.table(
+            {"key_id": self.key_id, "period_id": self.period_id, "value": self.value},
+            schema=DATA_SCHEMA,
+        )
 
 
 class SolutionData(BaseModel):
-    t_data_0: DataTable
+    t_data_0: Optional[DataTable] = None
     t_data_1: Optional[DataTable] = None
     t_data_2: Optional[DataTable] = None
     t_data_3: Optional[DataTable] = None
@@ -21,37 +77,217 @@ class SolutionData(BaseModel):
     t_data_7: Optional[DataTable] = None
 
     @classmethod
-    def from_binary(cls, t_key_index: list[KeyIndexTable], binary_data: bytes) -> Self:
+    def from_binary(
+        cls,
+        t_key_index: list[KeyIndexTable] | pa.Table,
+        binary_data: bytes | memoryview | dict[int, bytes | memoryview],
+    ) -> Self:
         """
         Process binary data with the t_key_index table. If the t_key_index table is filtered,
         te resulting data will correspond to it.
 
+        Every period type is stored in its own t_data_N.BIN file, keys of a period type whose
+        binary data is not given are skipped.
+
         Args:
-            t_key_index (List[KeyIndexTable]): The list containing t_key_index data.
-            binary_data (bytes): The binary data to read.
+            t_key_index (List[KeyIndexTable] | pa.Table): The t_key_index data.
+            binary_data (bytes | memoryview | dict[int, bytes | memoryview]): The binary data
+                of every period type id, a single buffer is read as period type 0. Buffers can
+                be memory maps.
 
         Returns:
             SolutionData: The SolutionData with processed t_key_index data.
 
         """
-        key_ids: list[int] = []
-        period_ids: list[int] = []
-        values: list[float] = []
-
-        for data in t_key_index:
-            if data.period_type_id != 0:
-                continue
-            binary_value = binary_data[data.position : data.position + data.length * 8]
-            values.extend(read_double_values(binary_value))
-            period_ids.extend(
-                range(1 + data.period_offset, 1 + data.length + data.period_offset)
+        if not isinstance(binary_data, dict):
+            binary_data = {0: binary_data}
+        if not isinstance(t_key_index, pa.Table):
+            t_key_index = pa.Table.from_pylist(
+                [data.model_dump() for data in t_key_index],
+                schema=SOLUTION_SCHEMAS["t_key_index"],
             )
-            key_ids.extend([data.key_id] * data.length)
 
         return cls(
-            t_data_0=DataTable(key_id=key_ids, period_id=period_ids, value=values)
+            **{
+                f"t_data_{period_type_id}": DataTable.from_key_index(
+                    t_key_index.filter(
+                        pc.equal(t_key_index.column("period_type_id"), period_type_id)
+                    ),
+                    period_data,
+                )
+                for period_type_id, period_data in binary_data.items()
+            }
+        )
+
+    def to_arrow(self) -> dict[str, pa.Table]:
+        """
+        Convert every t_data table to Arrow, tables without binary data are empty.
+
+        Returns:
+            dict[str, pa.Table]: The t_data tables by name.
+        """
+        return {
+            table_name: (
+                table_data.to_arrow()
+                if table_data is not None
+                else DATA_SCHEMA.empty_table()
+            )
+            for table_name, table_data in self
+        }
+
+
+def decode_key_index(
+    key_id: ArrayLike,
+    position: ArrayLike,
+    length: ArrayLike,
+    period_offset: ArrayLike,
+    binary_data: bytes | memoryview,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode the runs described by the t_key_index columns into the key_id, period_id and value
+    columns of a t_data table. Every key contributes `length` consecutive doubles stored at
+    byte `position`, numbered from `period_offset + 1`.
+
+    When the keys are stored back to back the value column is a view over `binary_data`
+    and no value is copied, otherwise the values are gathered from it.
+
+    Args:
+        key_id (ArrayLike): key_id column of t_key_index.
+        position (ArrayLike): byte position of every key inside the binary data.
+        length (ArrayLike): number of values stored for every key.
+        period_offset (ArrayLike): period offset of every key.
+        binary_data (bytes | memoryview): The binary data to read, only the byte ranges of
+            the keys are touched so a memory map is paged in on demand.
+
+    Raises:
+        ValueError: If a key points outside of the binary data.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The key_id, period_id and value columns.
+    """
+    key_id = np.asarray(key_id, dtype=np.int64)
+    position = np.asarray(position, dtype=np.int64)
+    length = np.asarray(length, dtype=np.int64)
+    period_offset = np.asarray(period_offset, dtype=np.int64)
+
+    if length.size and int((position + length * 8).max()) > len(binary_data):
+        raise ValueError("t_key_index points outside of the binary data")
+
+    total = int(length.sum())
+    # index of every row inside its own key run: 0, 1, ..., length - 1
+    row_start = np.cumsum(length) - length
+    run_index = np.arange(total, dtype=np.int64) - np.repeat(row_start, length)
+
+    key_ids = np.repeat(key_id.astype(np.int32), length)
+    period_ids = (run_index + np.repeat(period_offset + 1, length)).astype(np.int32)
+
+    aligned = bool(np.all(position % 8 == 0))
+    if aligned and is_contiguous(position, length):
+        offset = int(position[0]) if position.size else 0
+        values = np.frombuffer(binary_data, dtype="<f8", count=total, offset=offset)
+    elif aligned:
+        doubles = np.frombuffer(binary_data, dtype="<f8", count=len(binary_data) // 8)
+        values = doubles[run_index + np.repeat(position // 8, length)]
+    else:
+        values = np.concatenate(
+            [
+                np.frombuffer(binary_data, dtype="<f8", count=count, offset=offset)
+                for offset, count in zip(position.tolist(), length.tolist())
+            ]
+            or [np.empty(0, dtype="<f8")]
         )
 
+    return key_ids, period_ids, values
+
+
+def iter_data_batches(
+    bin_file: IO[bytes], t_key_index: pa.Table, batch_rows: int
+) -> Iterator[pa.RecordBatch]:
+    """
+    Decode the keys of t_key_index from a binary file in batches of at most `batch_rows` rows.
+    Keys are read in position order, so the file is only read forward and only the bytes of the
+    current batch are kept in memory. Keys longer than `batch_rows` are split across batches.
+
+    Args:
+        bin_file (IO[bytes]): seekable binary file, e.g. an open zip member.
+        t_key_index (pa.Table): t_key_index rows of a single period type.
+        batch_rows (int): maximum number of rows of every batch.
+
+    Yields:
+        pa.RecordBatch: batches with the key_id, period_id and value columns.
+    """
+    if batch_rows < 1:
+        raise ValueError("batch_rows must be positive")
+
+    order = np.argsort(t_key_index.column("position").to_numpy(), kind="stable")
+    key_index = t_key_index.take(order)
+
+    buffer = bytearray()
+    segments: list[tuple[int, int, int]] = []
+    rows = 0
+
+    for key_id, position, length, period_offset in zip(
+        key_index.column("key_id").to_pylist(),
+        key_index.column("position").to_pylist(),
+        key_index.column("length").to_pylist(),
+        key_index.column("period_offset").to_pylist(),
+    ):
+        start = 0
+        while start < length:
+            count = min(length - start, batch_rows - rows)
+            bin_file.seek(position + start * 8)
+            buffer += bin_file.read(count * 8)
+            segments.append((key_id, count, period_offset + start))
+            rows += count
+            start += count
+
+            if rows == batch_rows:
+                yield segments_to_batch(segments, buffer)
+                buffer = bytearray()
+                segments = []
+                rows = 0
+
+    if rows:
+        yield segments_to_batch(segments, buffer)
+
+
+def segments_to_batch(
+    segments: list[tuple[int, int, int]], buffer: bytearray
+) -> pa.RecordBatch:
+    """
+    Build a record batch from key runs stored back to back in `buffer`.
+
+    Args:
+        segments (list[tuple[int, int, int]]): key_id, length and period_offset of every run.
+        buffer (bytearray): values of the runs, the batch keeps a reference to it.
+
+    Returns:
+        pa.RecordBatch: batch with the key_id, period_id and value columns.
+    """
+    key_id, length, period_offset = np.array(segments, dtype=np.int64).T
+    key_ids, period_ids, values = decode_key_index(
+        key_id=key_id,
+        position=(np.cumsum(length) - length) * 8,
+        length=length,
+        period_offset=period_offset,
+        binary_data=buffer,
+    )
+    return pa.record_batch([key_ids, period_ids, values], schema=DATA_SCHEMA)
+
+
+def is_contiguous(position: np.ndarray, length: np.ndarray) -> bool:
+    """
+    Check if the key runs follow each other in the binary data without gaps.
+
+    Args:
+        position (np.ndarray): byte position of every key.
+        length (np.ndarray): number of values stored for every key.
+
+    Returns:
+        bool: True if every run starts where the previous one ends.
+    """
+    return bool(np.array_equal(position[1:], position[:-1] + length[:-1] * 8))
+
 
 def read_double_values(binary_data: bytes) -> list[float]:
     """
@@ -0,0 +1,127 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
+
+# size of the fixed part of a zip local file header
+LOCAL_HEADER_SIZE = 30
+
+
+def map_zip_member(
+    zip_ref: ZipFile, member_name: str, extract_dir: str | Path | None = None
+) -> memoryview:
+    """Memory-map a member of a zip archive.
+
+    Stored (uncompressed) members are mapped directly from the archive at their data offset.
+    Compressed members are extracted once to a cache file inside `extract_dir` and that file
+    is mapped instead, later calls reuse the extracted file. Only the byte ranges that are
+    read from the returned buffer are paged in.
+
+    Args:
+        zip_ref (ZipFile): Open zip archive, it must have been opened from a path.
+        member_name (str): Name of the member to map.
+        extract_dir (str | Path | None, optional): Folder for extracted members. Defaults to
+            a "pyplexos" folder inside the system temporary directory.
+
+    Returns:
+        memoryview: Read only view over the member bytes.
+    """
+    info = zip_ref.getinfo(member_name)
+
+    if info.file_size == 0:
+        return memoryview(b"")
+
+    if info.compress_type == ZIP_STORED:
+        offset = member_data_offset(zip_ref, info)
+        return map_file(Path(zip_ref.filename), offset, info.file_size)  # type: ignore
+
+    extract_path = member_extract_path(zip_ref, info, extract_dir)
+    if not extract_path.exists() or extract_path.stat().st_size != info.file_size:
+        extract_member(zip_ref, info, extract_path)
+
+    return map_file(extract_path, 0, info.file_size)
+
+
+def member_data_offset(zip_ref: ZipFile, info: ZipInfo) -> int:
+    """Get the offset of the member data inside the archive file.
+
+    The local header can have a different extra field than the central directory, so its
+    variable lengths are read from the archive itself.
+
+    Args:
+        zip_ref (ZipFile): Open zip archive.
+        info (ZipInfo): Member information.
+
+    Returns:
+        int: Byte offset of the first data byte of the member.
+    """
+    with open(zip_ref.filename, "rb") as file:  # type: ignore
+        file.seek(info.header_offset)
+        header = file.read(LOCAL_HEADER_SIZE)
+
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return info.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+
+
+def member_extract_path(
+    zip_ref: ZipFile, info: ZipInfo, extract_dir: str | Path | None
+) -> Path:
+    """Build the cache file path of a compressed member.
+
+    The name depends on the archive path, size and modification time, and on the member
+    name and CRC, so a modified archive never reuses a stale extraction.
+
+    Args:
+        zip_ref (ZipFile): Open zip archive.
+        info (ZipInfo): Member information.
+        extract_dir (str | Path | None): Folder for extracted members.
+
+    Returns:
+        Path: Path of the extracted member.
+    """
+    folder = Path(extract_dir or Path(tempfile.gettempdir()) / "pyplexos")
+    archive = Path(zip_ref.filename).resolve()  # type: ignore
+    stat = archive.stat()
+    digest = hashlib.sha1(
+        f"{archive}|{stat.st_size}|{stat.st_mtime_ns}|{info.filename}|{info.CRC}".encode()
+    ).hexdigest()[:16]
+    return folder / f"{archive.stem}.{digest}.{Path(info.filename).name}"
+
+
+def extract_member(zip_ref: ZipFile, info: ZipInfo, extract_path: Path) -> None:
+    """Decompress a member to `extract_path`, replacing it atomically when done.
+
+    Args:
+        zip_ref (ZipFile): Open zip archive.
+        info (ZipInfo): Member information.
+        extract_path (Path): Destination file.
+    """
+    extract_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=extract_path.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as target, zip_ref.open(info) as source:
+            while chunk := source.read(1 << 24):
+                target.write(chunk)
+        os.replace(temp_name, extract_path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def map_file(path: Path, offset: int, size: int) -> memoryview:
+    """Memory-map `size` bytes of a file starting at `offset`.
+
+    Args:
+        path (Path): File to map.
+        offset (int): First byte of the view.
+        size (int): Number of bytes of the view.
+
+    Returns:
+        memoryview: Read only view, it keeps the mapping alive while referenced.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)[offset : offset + size]
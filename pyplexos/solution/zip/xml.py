@@ -1,10 +1,24 @@
 import datetime as dt
-import xmltodict
+import pyarrow as pa
 
 # from io import BytesIO, StringIO
 from pydantic import BaseModel, field_validator, Field
-from typing import Optional, OrderedDict, Any, IO
-from pyplexos.solution.schema import SolutionSchema
+from typing import Optional, IO, Callable, Iterable
+from pyplexos.utils.arrow import schema_from_model, table_models
+from pyplexos.utils.xml import ISO_FORMAT, read_dataset, read_dataset_tables
+
+# t_period_0 is written day first, the other period tables use ISO 8601
+DAY_FIRST_FORMAT = r"%d/%m/%Y %H:%M:%S"
+
+
+def parse_datetime(value: str | dt.datetime) -> dt.datetime:
+    """Parse a PLEXOS datetime in either of its formats, used by the table validators."""
+    if isinstance(value, dt.datetime):
+        return value
+    try:
+        return dt.datetime.strptime(value, ISO_FORMAT)
+    except ValueError:
+        return dt.datetime.strptime(value, DAY_FIRST_FORMAT)
 
 
 class UnitTable(BaseModel):
@@ -152,7 +166,7 @@ class Period0Table(BaseModel):
     @field_validator("datetime", mode="before")
     @classmethod
     def decode_datetime(cls, value: str) -> dt.datetime:
-        return dt.datetime.strptime(value, r"%d/%m/%Y %H:%M:%S")
+        return parse_datetime(value)
 
 
 class Phase3Table(BaseModel):
@@ -296,7 +310,7 @@ class Period1Table(BaseModel):
     @field_validator("date", mode="before")
     @classmethod
     def decode_datetime(cls, value: str) -> dt.date:
-        return dt.datetime.strptime(value, r"%Y-%m-%dT%H:%M:%S").date()
+        return parse_datetime(value).date()
 
 
 class Period2Table(BaseModel):
@@ -310,7 +324,7 @@ class Period2Table(BaseModel):
     @field_validator("week_ending", mode="before")
     @classmethod
     def decode_datetime(cls, value: str) -> dt.date:
-        return dt.datetime.strptime(value, r"%Y-%m-%dT%H:%M:%S").date()
+        return parse_datetime(value).date()
 
 
 class Period3Table(BaseModel):
@@ -324,7 +338,7 @@ class Period3Table(BaseModel):
     @field_validator("month_beginning", mode="before")
     @classmethod
     def decode_datetime(cls, value: str) -> dt.date:
-        return dt.datetime.strptime(value, r"%Y-%m-%dT%H:%M:%S").date()
+        return parse_datetime(value).date()
 
 
 class Period4Table(BaseModel):
@@ -338,7 +352,7 @@ class Period4Table(BaseModel):
     @field_validator("year_ending", mode="before")
     @classmethod
     def decode_datetime(cls, value: str) -> dt.date:
-        return dt.datetime.strptime(value, r"%Y-%m-%dT%H:%M:%S").date()
+        return parse_datetime(value).date()
 
 
 class Period6Table(BaseModel):
@@ -353,7 +367,7 @@ class Period6Table(BaseModel):
     @field_validator("datetime", mode="before")
     @classmethod
     def decode_datetime(cls, value: str) -> dt.datetime:
-        return dt.datetime.strptime(value, r"%Y-%m-%dT%H:%M:%S")
+        return parse_datetime(value)
 
 
 class Period7Table(BaseModel):
@@ -367,7 +381,7 @@ class Period7Table(BaseModel):
     @field_validator("quarter_beginning", mode="before")
     @classmethod
     def decode_datetime(cls, value: str) -> dt.date:
-        return dt.datetime.strptime(value, r"%Y-%m-%dT%H:%M:%S").date()
+        return parse_datetime(value).date()
 
 
 class Phase1Table(BaseModel):
@@ -436,13 +450,53 @@ class SolutionModel(BaseModel):
     t_object_meta: Optional[list[ObjectMetaTable]] = None
 
     @classmethod
-    def from_xml(cls, xml_file: str | IO[bytes]):
-        namespace = {"http://tempuri.org/SolutionDataset.xsd": None}
-        force_list_data = [value.name for value in SolutionSchema]
-        content: OrderedDict[str, Any] = xmltodict.parse(
-            xml_input=xml_file,
-            force_list=force_list_data,
-            process_namespaces=True,
-            namespaces=namespace,
+    def from_xml(cls, xml_file: str | IO[bytes], validate: bool | float = True):
+        """
+        Read the .xml file into the model, see `read_dataset`.
+        """
+        return read_dataset(
+            cls,
+            "SolutionDataset",
+            xml_file,
+            schemas=SOLUTION_SCHEMAS,
+            datetime_formats=DATETIME_FORMATS,
+            validate=validate,
+        )
+
+    @classmethod
+    def tables_from_xml(
+        cls,
+        xml_file: str | IO[bytes],
+        tables: Iterable[str] | None = None,
+        on_table: Callable[[str, pa.Table], None] | None = None,
+        validate: bool | float = False,
+    ) -> dict[str, pa.Table]:
+        """
+        Stream the .xml file into arrow tables typed with SOLUTION_SCHEMAS, t_period_0 dates
+        are read day first, see `read_dataset_tables`.
+        """
+        return read_dataset_tables(
+            cls,
+            xml_file,
+            schemas=SOLUTION_SCHEMAS,
+            tables=tables,
+            datetime_formats=DATETIME_FORMATS,
+            on_table=on_table,
+            validate=validate,
         )
-        return cls(**content["SolutionDataset"])
+
+
+SOLUTION_SCHEMAS: dict[str, pa.Schema] = {
+    table_name: schema_from_model(model)
+    for table_name, model in table_models(SolutionModel).items()
+}
+
+# both formats are accepted in every table, the usual one of the table is tried first
+DATETIME_FORMATS: dict[str, tuple[str, ...]] = {
+    table_name: (
+        (DAY_FIRST_FORMAT, ISO_FORMAT)
+        if table_name == "t_period_0"
+        else (ISO_FORMAT, DAY_FIRST_FORMAT)
+    )
+    for table_name in SOLUTION_SCHEMAS
+}
@@ -0,0 +1,151 @@
+import datetime as dt
+import types
+from typing import Any, Union, get_args, get_origin
+
+import pyarrow as pa
+from pydantic import BaseModel
+
+# python annotation -> arrow type, unions like `float | int` take their first member.
+# Integers are ids, counts and enums of PLEXOS tables, all of them fit in int32.
+ARROW_TYPES: dict[Any, pa.DataType] = {
+    int: pa.int32(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    str: pa.string(),
+    dt.datetime: pa.timestamp("us"),
+    dt.date: pa.date32(),
+}
+
+# columns narrower or wider than the type of their annotation
+COLUMN_TYPES: dict[str, pa.DataType] = {
+    "period_type_id": pa.int8(),
+    "phase_id": pa.int8(),
+    # byte offset inside the t_data_N.BIN files, they can be larger than 2 GB
+    "position": pa.int64(),
+}
+
+# names repeat a lot (object, collection and property names), they are dictionary encoded
+NAME_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+
+def arrow_type(name: str, annotation: Any) -> pa.DataType:
+    """Arrow type of a table model field.
+
+    Args:
+        name (str): field name, e.g. "key_id" or "child_name".
+        annotation (Any): field annotation.
+
+    Returns:
+        pa.DataType: the narrowest type that holds the values of the field.
+    """
+    annotation = unwrap_optional(annotation)
+    if name in COLUMN_TYPES:
+        return COLUMN_TYPES[name]
+    if annotation is str and (name == "name" or name.endswith("_name")):
+        return NAME_TYPE
+    return ARROW_TYPES[annotation]
+
+
+def unwrap_optional(annotation: Any) -> Any:
+    """Drop `None` from an `Optional[X]` / `X | None` annotation.
+
+    Args:
+        annotation (Any): type annotation.
+
+    Returns:
+        Any: the annotation without None, the first member for other unions.
+    """
+    if get_origin(annotation) in (Union, types.UnionType):
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return members[0]
+    return annotation
+
+
+def schema_from_model(model: type[BaseModel]) -> pa.Schema:
+    """Arrow schema of the rows of a pydantic table model, columns are named by alias and
+    typed with `arrow_type`.
+
+    Args:
+        model (type[BaseModel]): row model, e.g. KeyTable.
+
+    Returns:
+        pa.Schema: schema with one field per model field.
+    """
+    return pa.schema(
+        [
+            pa.field(
+                field.alias or name,
+                arrow_type(name, field.annotation),
+                nullable=not field.is_required(),
+            )
+            for name, field in model.model_fields.items()
+        ]
+    )
+
+
+def table_models(model: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    """Row model of every table of a dataset model, e.g. SolutionModel or MasterDataSet.
+
+    Args:
+        model (type[BaseModel]): dataset model whose fields are `list[RowModel]`.
+
+    Returns:
+        dict[str, type[BaseModel]]: row model by table name.
+    """
+    return {
+        name: get_args(unwrap_optional(field.annotation))[0]
+        for name, field in model.model_fields.items()
+    }
+
+
+def model_from_tables(model: type[BaseModel], tables: dict[str, pa.Table]) -> BaseModel:
+    """Build a dataset model from typed arrow tables without validating the rows.
+
+    Args:
+        model (type[BaseModel]): dataset model, e.g. SolutionModel or MasterDataSet.
+        tables (dict[str, pa.Table]): tables by name, columns named by alias.
+
+    Returns:
+        BaseModel: the dataset, built with `model_construct`.
+    """
+    row_models = table_models(model)
+    return model.model_construct(
+        **{
+            table_name: [
+                row_models[table_name].model_construct(**row) for row in table.to_pylist()
+            ]
+            for table_name, table in tables.items()
+        }
+    )
+
+
+def tables_from_model(
+    dataset: BaseModel, schemas: dict[str, pa.Schema]
+) -> dict[str, pa.Table]:
+    """Typed arrow tables of the rows of a dataset model, the inverse of `model_from_tables`.
+
+    Rows are read from their attributes and not with `model_dump`, whose field serializers
+    write values for the XML (e.g. the dates of t_date_from as ISO strings).
+
+    Args:
+        dataset (BaseModel): dataset model, e.g. SolutionModel or MasterDataSet.
+        schemas (dict[str, pa.Schema]): schema of every table to build, by table name.
+
+    Returns:
+        dict[str, pa.Table]: the tables by name, columns named by alias.
+    """
+    row_models = table_models(type(dataset))
+    tables: dict[str, pa.Table] = {}
+    for table_name, schema in schemas.items():
+        columns = {
+            name: field.alias or name
+            for name, field in row_models[table_name].model_fields.items()
+        }
+        tables[table_name] = pa.Table.from_pylist(
+            [
+                {alias: getattr(row, name) for name, alias in columns.items()}
+                for row in getattr(dataset, table_name) or []
+            ],
+            schema=schema,
+        )
+    return tables
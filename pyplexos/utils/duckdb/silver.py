@@ -33,10 +33,21 @@ link_map: dict[str,int] = {
     "constraint_variable": 645,
 }
 
-def get_link_factory(conn: duck.DuckDBPyConnection, collection_id: int, parent_id: int, child_id: int) -> pl.LazyFrame:
-    t_membership: pl.LazyFrame = conn.table("bronze.t_membership").pl().lazy()
-    t_child: pl.LazyFrame = conn.table("bronze.t_object").pl().lazy()
-    t_parent: pl.LazyFrame = conn.table("bronze.t_object").pl().lazy()
+def get_link_factory(
+    conn: duck.DuckDBPyConnection,
+    collection_id: int,
+    parent_id: int,
+    child_id: int,
+    t_membership: pl.LazyFrame | None = None,
+    t_object: pl.LazyFrame | None = None,
+) -> pl.LazyFrame:
+    # the bronze tables are read once by set_silver_schema and shared by every link
+    if t_membership is None:
+        t_membership = conn.table("bronze.t_membership").pl().lazy()
+    if t_object is None:
+        t_object = conn.table("bronze.t_object").pl().lazy()
+    t_child: pl.LazyFrame = t_object
+    t_parent: pl.LazyFrame = t_object
 
     return (
         t_membership
@@ -183,13 +194,17 @@ def set_silver_schema(conn: duck.DuckDBPyConnection) -> None:
     conn.from_arrow(lazy_date.collect().to_arrow()).to_table("silver.dim_datetime")
 
     t_collection: pl.LazyFrame = conn.table("bronze.t_collection").pl().lazy()
+    t_membership: pl.LazyFrame = conn.table("bronze.t_membership").pl().lazy()
+    t_object: pl.LazyFrame = conn.table("bronze.t_object").pl().lazy()
     for name, collection_value in link_map.items():
         filter_collection: pl.LazyFrame = t_collection.filter(pl.col("collection_id").eq(collection_value))
         child_id: int = filter_collection.select(pl.col("child_class_id")).collect().item()
         parent_id: int = filter_collection.select(pl.col("parent_class_id")).collect().item()
         parent_name: str = filter_collection.select(pl.col("complement_name")).collect().item().lower()
         child_name: str = filter_collection.select(pl.col("name")).collect().item().lower()
-        lazy_link: pl.LazyFrame = get_link_factory(conn, collection_value, parent_id, child_id)
+        lazy_link: pl.LazyFrame = get_link_factory(
+            conn, collection_value, parent_id, child_id, t_membership, t_object
+        )
         lazy_link = lazy_link.rename(
             {
                 "parent_object_id": f"id_{parent_name}",
@@ -0,0 +1,368 @@
+from typing import IO, Any, Callable, Iterable, OrderedDict, Sequence
+from xml.parsers import expat
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import xmltodict
+from pydantic import BaseModel
+
+from pyplexos.utils.arrow import model_from_tables, table_models
+
+# rows kept as python strings before they are converted to an arrow batch
+BATCH_ROWS = 65_536
+
+ISO_FORMAT = r"%Y-%m-%dT%H:%M:%S"
+
+
+class TableBuilder:
+    """
+    Column builder of a table: the text of every field is appended to its column and converted
+    to the schema types every `BATCH_ROWS` rows. One of every `validate_every` rows is also
+    validated with `row_model`, before its text is converted.
+    """
+
+    def __init__(
+        self,
+        schema: pa.Schema,
+        datetime_formats: Sequence[str] = (ISO_FORMAT,),
+        row_model: type[BaseModel] | None = None,
+        validate_every: int = 0,
+    ) -> None:
+        self.schema = schema
+        self.datetime_formats = datetime_formats
+        self.row_model = row_model
+        self.validate_every = validate_every
+        self.columns: dict[str, list[str | None]] = {name: [] for name in schema.names}
+        self.batches: list[pa.RecordBatch] = []
+        self.rows = 0
+        self.total_rows = 0
+
+    def append(self, row: dict[str, str]) -> None:
+        if (
+            self.row_model is not None
+            and self.validate_every
+            and self.total_rows % self.validate_every == 0
+        ):
+            self.row_model.model_validate(row)
+
+        for name, column in self.columns.items():
+            column.append(row.get(name))
+        self.rows += 1
+        self.total_rows += 1
+
+        if self.rows == BATCH_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+
+        self.batches.append(
+            pa.record_batch(
+                [
+                    convert_column(
+                        self.columns[field.name], field.type, self.datetime_formats
+                    )
+                    for field in self.schema
+                ],
+                schema=self.schema,
+            )
+        )
+        self.columns = {name: [] for name in self.schema.names}
+        self.rows = 0
+
+    def to_arrow(self) -> pa.Table:
+        self.flush()
+        return pa.Table.from_batches(self.batches, schema=self.schema).unify_dictionaries()
+
+
+def convert_column(
+    values: list[str | None], data_type: pa.DataType, datetime_formats: Sequence[str]
+) -> pa.Array:
+    """Convert the text of a column to its arrow type in a single vectorized pass.
+
+    Args:
+        values (list[str | None]): text of every row, None for missing or empty elements.
+        data_type (pa.DataType): target type.
+        datetime_formats (Sequence[str]): strptime formats of timestamp and date columns.
+
+    Returns:
+        pa.Array: typed column.
+    """
+    text = pa.array(values, type=pa.string())
+
+    if pa.types.is_string(data_type):
+        return text
+
+    if pa.types.is_dictionary(data_type):
+        return pc.cast(text.dictionary_encode(), data_type)
+
+    text = pc.utf8_trim_whitespace(text)
+
+    if pa.types.is_timestamp(data_type) or pa.types.is_date(data_type):
+        return pc.cast(parse_datetimes(text, datetime_formats), data_type)
+
+    return pc.cast(text, data_type)
+
+
+def parse_datetimes(text: pa.Array, datetime_formats: Sequence[str]) -> pa.Array:
+    """Parse a column of datetimes written in any of several formats.
+
+    Every format is applied to the whole column at once and only fills the rows the previous
+    formats could not parse, so a column in a single format is parsed in one pass.
+
+    Args:
+        text (pa.Array): datetime strings.
+        datetime_formats (Sequence[str]): strptime formats, most likely first.
+
+    Raises:
+        ValueError: If a value does not match any of the formats.
+
+    Returns:
+        pa.Array: timestamp[us] column, null where the text is null.
+    """
+    timestamps = pc.strptime(
+        text, format=datetime_formats[0], unit="us", error_is_null=True
+    )
+    for datetime_format in datetime_formats[1:]:
+        if timestamps.null_count == text.null_count:
+            break
+        timestamps = pc.coalesce(
+            timestamps,
+            pc.strptime(text, format=datetime_format, unit="us", error_is_null=True),
+        )
+
+    if timestamps.null_count != text.null_count:
+        unparsed = pc.and_(pc.is_null(timestamps), pc.is_valid(text))
+        raise ValueError(
+            f"datetime {text.filter(unparsed)[0]} does not match {list(datetime_formats)}"
+        )
+
+    return timestamps
+
+
+def sample_stride(validate: bool | float) -> int:
+    """Validate one of every N rows for a `validate` flag or fraction of rows.
+
+    Args:
+        validate (bool | float): True for every row, False for none or the fraction of rows,
+            e.g. 0.01 for one row in a hundred.
+
+    Raises:
+        ValueError: If the fraction is not in [0, 1].
+
+    Returns:
+        int: N, 0 when no row is validated.
+    """
+    if isinstance(validate, bool):
+        return int(validate)
+    if not 0 <= validate <= 1:
+        raise ValueError(f"validate must be a bool or a fraction of rows, got {validate}")
+    return max(1, round(1 / validate)) if validate else 0
+
+
+def read_xml_tables(
+    xml_file: str | IO[bytes],
+    schemas: dict[str, pa.Schema],
+    datetime_formats: dict[str, Sequence[str]] | None = None,
+    on_table: Callable[[str, pa.Table], None] | None = None,
+    row_models: dict[str, type[BaseModel]] | None = None,
+    validate: bool | float = False,
+) -> dict[str, pa.Table]:
+    """Stream a .NET DataSet XML file (`<DataSet><t_table><field>text</field>...</t_table>...`)
+    into arrow tables.
+
+    The file is tokenized incrementally by expat and the text of every field is appended to the
+    column builders of its table, no element tree is built. Elements of tables or fields not in
+    `schemas` are ignored and tables without rows are returned empty with their schema.
+
+    Args:
+        xml_file (str | IO[bytes]): path or binary file object of the XML.
+        schemas (dict[str, pa.Schema]): schema of every table to read.
+        datetime_formats (dict[str, Sequence[str]] | None, optional): strptime formats of the
+            timestamp and date columns of every table, see `parse_datetimes`. Defaults to
+            ISO 8601.
+        on_table (Callable[[str, pa.Table], None] | None, optional): called with the table
+            read so far every time a run of rows of a table ends, i.e. when the next element
+            belongs to another table or the document ends. Lets a caller start working on a
+            table before the rest of the file is parsed.
+        row_models (dict[str, type[BaseModel]] | None, optional): pydantic model of the rows
+            of every table, used to validate them.
+        validate (bool | float, optional): validate every row (True), none (False) or a
+            sample with this fraction of the rows of every table, evenly spaced. Catches
+            changes of the file format without the cost of validating every row. Defaults
+            to False.
+
+    Raises:
+        pydantic.ValidationError: If a validated row does not match its model.
+
+    Returns:
+        dict[str, pa.Table]: the tables by name.
+    """
+    datetime_formats = datetime_formats or {}
+    row_models = row_models or {}
+    validate_every = sample_stride(validate)
+    builders = {
+        table_name: TableBuilder(
+            schema,
+            datetime_formats.get(table_name, (ISO_FORMAT,)),
+            row_model=row_models.get(table_name),
+            validate_every=validate_every,
+        )
+        for table_name, schema in schemas.items()
+    }
+
+    depth = 0
+    builder: TableBuilder | None = None
+    row: dict[str, str] = {}
+    field_name = ""
+    text: list[str] = []
+    # table of the current run of rows
+    run_table = ""
+
+    def local_name(name: str) -> str:
+        return name.rpartition("}")[2]
+
+    def end_run(table_name: str) -> None:
+        if on_table is not None and table_name in builders:
+            on_table(table_name, builders[table_name].to_arrow())
+
+    def start_element(name: str, attributes: dict[str, str]) -> None:
+        nonlocal depth, builder, row, field_name, run_table
+        depth += 1
+        if depth == 2:
+            table_name = local_name(name)
+            if table_name != run_table:
+                end_run(run_table)
+                run_table = table_name
+            builder = builders.get(table_name)
+            row = {}
+        elif depth == 3 and builder is not None:
+            field_name = local_name(name)
+            text.clear()
+
+    def end_element(name: str) -> None:
+        nonlocal depth, builder
+        if depth == 3 and builder is not None and text:
+            row[field_name] = "".join(text)
+        elif depth == 2 and builder is not None:
+            builder.append(row)
+            builder = None
+        depth -= 1
+
+    def character_data(data: str) -> None:
+        if depth == 3 and builder is not None:
+            text.append(data)
+
+    parser = expat.ParserCreate(namespace_separator="}")
+    parser.buffer_text = True
+    parser.buffer_size = 1 << 16
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+
+    if isinstance(xml_file, str):
+        with open(xml_file, "rb") as file:
+            parser.ParseFile(file)
+    else:
+        parser.ParseFile(xml_file)
+    end_run(run_table)
+
+    return {table_name: builder.to_arrow() for table_name, builder in builders.items()}
+
+
+def read_dataset_tables(
+    dataset: type[BaseModel],
+    xml_file: str | IO[bytes],
+    schemas: dict[str, pa.Schema],
+    tables: Iterable[str] | None = None,
+    datetime_formats: dict[str, Sequence[str]] | None = None,
+    on_table: Callable[[str, pa.Table], None] | None = None,
+    validate: bool | float = False,
+) -> dict[str, pa.Table]:
+    """Stream the XML file of a dataset model straight into typed arrow tables, without
+    building the document or validating the rows with the table models.
+
+    Every table is returned with its schema, absent tables are empty. When `tables` is given
+    only those tables are returned, the rows of the other tables are skipped by the parser
+    without collecting their text.
+
+    Args:
+        dataset (type[BaseModel]): dataset model, e.g. SolutionModel or MasterDataSet.
+        xml_file (str | IO[bytes]): path or binary file object of the XML.
+        schemas (dict[str, pa.Schema]): schema of every table of the dataset.
+        tables (Iterable[str] | None, optional): only read these tables. Defaults to every
+            table of `schemas`.
+        datetime_formats (dict[str, Sequence[str]] | None, optional): strptime formats of
+            every table, see `read_xml_tables`.
+        on_table (Callable[[str, pa.Table], None] | None, optional): called as soon as a table
+            has been read, see `read_xml_tables`.
+        validate (bool | float, optional): validate all or a fraction of the rows with the
+            table models of `dataset`, see `read_xml_tables`. Defaults to False.
+
+    Returns:
+        dict[str, pa.Table]: the tables by name.
+    """
+    if tables is not None:
+        schemas = {
+            table_name: schemas[table_name]
+            for table_name in tables
+            if table_name in schemas
+        }
+    return read_xml_tables(
+        xml_file,
+        schemas=schemas,
+        datetime_formats=datetime_formats,
+        on_table=on_table,
+        row_models=table_models(dataset),
+        validate=validate,
+    )
+
+
+def read_dataset(
+    dataset: type[BaseModel],
+    root: str,
+    xml_file: str | IO[bytes],
+    schemas: dict[str, pa.Schema],
+    datetime_formats: dict[str, Sequence[str]] | None = None,
+    validate: bool | float = True,
+) -> BaseModel:
+    """Read the XML file of a dataset model into the model.
+
+    With validate=True the document is parsed with xmltodict and every row is validated by
+    its table model. Otherwise the file is streamed into typed columns (see
+    `read_dataset_tables`) and the rows are built from them without validation, a fraction
+    like 0.01 still validates that share of the rows.
+
+    Args:
+        dataset (type[BaseModel]): dataset model, e.g. SolutionModel or MasterDataSet.
+        root (str): root element of the XML, its namespace is http://tempuri.org/{root}.xsd.
+        xml_file (str | IO[bytes]): path or binary file object of the XML.
+        schemas (dict[str, pa.Schema]): schema of every table of the dataset.
+        datetime_formats (dict[str, Sequence[str]] | None, optional): strptime formats of
+            every table when streaming, see `read_xml_tables`.
+        validate (bool | float, optional): validate every row, none or a fraction of them.
+            Defaults to True.
+
+    Returns:
+        BaseModel: the dataset.
+    """
+    if validate is not True:
+        return model_from_tables(
+            dataset,
+            read_dataset_tables(
+                dataset,
+                xml_file,
+                schemas,
+                datetime_formats=datetime_formats,
+                validate=validate,
+            ),
+        )
+
+    content: OrderedDict[str, Any] = xmltodict.parse(
+        xml_input=xml_file,
+        force_list=list(dataset.model_fields),
+        process_namespaces=True,
+        namespaces={f"http://tempuri.org/{root}.xsd": None},
+    )
+    return dataset(**content[root])
@@ -1,6 +1,10 @@
+import io
+
+import pyarrow as pa
 import xmltodict
 
 import pyplexos.model.xml as xml_model
+from pyplexos.model import PlexosModel
 import datetime as dt
 
 
@@ -833,7 +837,7 @@ def test_property_tag_table():
         indent="  "
     ) == xml
 
-def test_master_dataset_table():
+def test_master_dataset_table(tmp_path):
     xml = (
         '<MasterDataSet xmlns="http://tempuri.org/MasterDataSet.xsd">\n'
             '  <t_attribute>\n'
@@ -1232,10 +1236,35 @@ def test_master_dataset_table():
             namespaces=namespace_in
         )['MasterDataSet']
     )
+    # Prueba de lectura sin validación y con validación por muestra
+    for validate in (False, 0.5):
+        assert xml_model.MasterDataSet.from_xml(
+            io.BytesIO(xml.encode()), validate=validate
+        ).model_dump() == table.model_dump()
     # Prueba de escritura de xml
     assert xmltodict.unparse(
         {'MasterDataSet': table.model_dump(by_alias=True, exclude_unset=True) | namespace_out},
         full_document=False,
         pretty=True,
         indent="  "
-    ) == xml
\ No newline at end of file
+    ) == xml
+    # Prueba de PlexosModel validado, las fechas de t_date_from y t_date_to son timestamps
+    xml_path = tmp_path / "model.xml"
+    xml_path.write_text(xml)
+    validated = PlexosModel.from_xml(str(xml_path), validate=True)
+    streamed = PlexosModel.from_xml(str(xml_path))
+    for table_name, table_data in validated.items():
+        assert table_data.equals(getattr(streamed, table_name)), table_name
+    assert validated.t_date_from.column("date").to_pylist() == [dt.datetime(2020,6,5,8)]
+
+def test_model_schemas():
+    schema = xml_model.MODEL_SCHEMAS["t_property"]
+    assert schema.field("property_id").type == pa.int32()
+    assert schema.field("period_type_id").type == pa.int8()
+    assert schema.field("name").type == pa.dictionary(pa.int32(), pa.string())
+    assert schema.field("default_value").type == pa.float64()
+    assert schema.field("is_key").type == pa.bool_()
+    assert schema.field("tag").nullable and not schema.field("name").nullable
+    # Prueba de columnas con alias
+    assert xml_model.MODEL_SCHEMAS["t_config"].names == ["element", "value"]
+    assert xml_model.MODEL_SCHEMAS["t_date_from"].field("date").type == pa.timestamp("us")
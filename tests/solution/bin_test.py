@@ -0,0 +1,72 @@
+import struct
+
+import numpy as np
+
+import pyplexos.solution.zip.bin as bin_model
+from pyplexos.solution.zip.xml import KeyIndexTable
+
+
+def legacy_from_binary(t_key_index, binary_data):
+    key_ids, period_ids, values = [], [], []
+    for data in t_key_index:
+        if data.period_type_id != 0:
+            continue
+        binary_value = binary_data[data.position : data.position + data.length * 8]
+        values.extend(bin_model.read_double_values(binary_value))
+        period_ids.extend(
+            range(1 + data.period_offset, 1 + data.length + data.period_offset)
+        )
+        key_ids.extend([data.key_id] * data.length)
+    return key_ids, period_ids, values
+
+
+def test_from_binary_matches_legacy_decoder():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=40)
+    values[3] = np.nan
+    values[7] = -0.0
+    binary_data = struct.pack("40d", *values)
+    t_key_index = [
+        KeyIndexTable(key_id=3, period_type_id=0, position=80, length=10, period_offset=0),
+        KeyIndexTable(key_id=1, period_type_id=0, position=0, length=10, period_offset=2),
+        KeyIndexTable(key_id=9, period_type_id=1, position=0, length=2, period_offset=0),
+        KeyIndexTable(key_id=2, period_type_id=0, position=160, length=20, period_offset=5),
+    ]
+
+    data = bin_model.SolutionData.from_binary(t_key_index, binary_data).t_data_0
+    key_ids, period_ids, legacy_values = legacy_from_binary(t_key_index, binary_data)
+
+    assert data.key_id.tolist() == key_ids
+    assert data.period_id.tolist() == period_ids
+    # TEST: valores idénticos a nivel de bits (incluye nan y -0.0)
+    assert data.value.tobytes() == struct.pack(f"{len(legacy_values)}d", *legacy_values)
+
+
+def test_decode_key_index_unaligned_and_empty():
+    binary_data = b"\x00" * 4 + struct.pack("3d", 1.5, 2.5, 3.5)
+    key_id, period_id, value = bin_model.decode_key_index(
+        key_id=[7], position=[4], length=[3], period_offset=[0], binary_data=binary_data
+    )
+    assert key_id.tolist() == [7, 7, 7]
+    assert period_id.tolist() == [1, 2, 3]
+    assert value.tolist() == [1.5, 2.5, 3.5]
+
+    key_id, period_id, value = bin_model.decode_key_index([], [], [], [], b"")
+    assert key_id.size == period_id.size == value.size == 0
+
+
+def test_contiguous_value_column_is_zero_copy():
+    binary_data = struct.pack("6d", *range(6))
+    data = bin_model.SolutionData.from_binary(
+        [
+            KeyIndexTable(key_id=1, period_type_id=0, position=8, length=2, period_offset=0),
+            KeyIndexTable(key_id=2, period_type_id=0, position=24, length=3, period_offset=0),
+        ],
+        binary_data,
+    ).to_arrow()["t_data_0"]
+
+    base = np.frombuffer(binary_data, dtype=np.uint8).ctypes.data
+    value = data.column("value").chunk(0)
+    # TEST: la columna value apunta directamente a los bytes del BIN
+    assert value.buffers()[1].address == base + 8
+    assert value.to_pylist() == [1.0, 2.0, 3.0, 4.0, 5.0]
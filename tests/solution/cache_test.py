@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+
+import polars as pl
+import pytest
+
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.cache import (
+    QueryCache,
+    cache_entries,
+    evict_cache,
+    invalidate_cache,
+    solution_cache_key,
+)
+from pyplexos.solution.schema import QuerySchema
+
+
+def test_from_zip_cache(solution_zip, tmp_path):
+    cache_dir = tmp_path / "cache"
+    expected = PlexosSolution.from_zip(str(solution_zip))
+
+    first = PlexosSolution.from_zip(str(solution_zip), cache_dir=str(cache_dir))
+    assert len(cache_entries(cache_dir)) == 1
+
+    # TEST: la segunda lectura viene del cache, sin leer el zip
+    timings: dict[str, float] = {}
+    second = PlexosSolution.from_zip(
+        str(solution_zip), cache_dir=str(cache_dir), timings=timings
+    )
+    assert timings == {}
+    for table_name, table in expected.items():
+        assert first[table_name].equals(table), table_name
+        assert second[table_name].equals(table), table_name
+
+    PlexosSolution.from_zip(
+        str(solution_zip), cache_dir=str(cache_dir), properties=[QuerySchema.NODE.PRICE]
+    )
+    assert len(cache_entries(cache_dir)) == 2
+
+
+def test_solution_cache_key(solution_zip):
+    key = solution_cache_key(solution_zip, objects=["G1", "N1"])
+
+    assert key == solution_cache_key(solution_zip, objects=["N1", "G1"])
+    assert key != solution_cache_key(solution_zip, objects=["G1"])
+
+    stat = solution_zip.stat()
+    os.utime(solution_zip, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert key != solution_cache_key(solution_zip, objects=["G1", "N1"])
+
+
+def test_cache_eviction_and_invalidation(solution_zip, stored_solution_zip, tmp_path):
+    cache_dir = tmp_path / "cache"
+    PlexosSolution.from_zip(str(solution_zip), cache_dir=str(cache_dir))
+    PlexosSolution.from_zip(str(stored_solution_zip), cache_dir=str(cache_dir))
+    PlexosSolution.from_zip(str(solution_zip), cache_dir=str(cache_dir), tables=["t_key"])
+
+    entries = cache_entries(cache_dir)
+    assert len(entries) == 3
+
+    # the least recently used entry goes first
+    removed = evict_cache(cache_dir, max_bytes=sum(size for _, size in entries) - 1)
+    assert removed == [entries[0][0]]
+
+    assert len(invalidate_cache(cache_dir, solution_zip)) == 1
+    assert [entry.name for entry, _ in cache_entries(cache_dir)] == [entries[1][0].name]
+    assert len(invalidate_cache(cache_dir)) == 1
+    assert cache_entries(cache_dir) == []
+
+
+def test_query_cache(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    first = solution.cmg
+    assert solution.cmg.equals(first)
+    wide = solution.query(QuerySchema.NODE.PRICE, layout="wide")
+    assert solution.query_cache.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+        "entries": 2,
+        "bytes": first.estimated_size() + wide.estimated_size(),
+    }
+
+    # TEST: modificar un resultado no cambia el cache
+    first.columns = [f"renamed_{column}" for column in first.columns]
+    solution.gen.insert_column(0, pl.Series("extra", [0] * solution.gen.height))
+    assert solution.cmg.columns[0] == "collection_name"
+    assert "extra" not in solution.gen.columns
+
+    # TEST: con un presupuesto para un solo resultado se descarta el más antiguo
+    solution.query_cache = QueryCache(max_bytes=first.estimated_size())
+    solution.cmg
+    solution.gen
+    stats = solution.query_cache.stats()
+    assert (stats["evictions"], stats["entries"]) == (1, 1)
+
+
+def test_query_cache_concurrent_misses():
+    cache = QueryCache()
+    calls = []
+
+    def compute() -> pl.DataFrame:
+        calls.append(1)
+        time.sleep(0.05)
+        return pl.DataFrame({"value": [1.0]})
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("key", compute)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result.equals(results[0]) for result in results)
+
+    with pytest.raises(ZeroDivisionError):
+        cache.get("error", lambda: 1 / 0)
+    assert cache.stats()["entries"] == 1
+
+
+def test_query_cache_shared_by_threads(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    barrier = threading.Barrier(4)
+    calls = []
+    run_query = solution.run_query
+
+    def counted_run_query(*args, **kwargs) -> pl.DataFrame:
+        calls.append(1)
+        return run_query(*args, **kwargs)
+
+    solution.run_query = counted_run_query
+
+    def query() -> pl.DataFrame:
+        barrier.wait()
+        return solution.cmg
+
+    threads = [threading.Thread(target=query) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # TEST: las consultas simultáneas de una solución nueva comparten el mismo cache
+    assert len(calls) == 1
+    assert solution.query_cache.stats()["entries"] == 1
@@ -0,0 +1,233 @@
+import datetime as dt
+import struct
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+HOURS = 48
+DAYS = 2
+
+# key_id: (membership_id, property_id, period_type_id)
+KEYS = {
+    1: (1, 1, 0),
+    2: (2, 1, 0),
+    3: (3, 1233, 0),
+    4: (4, 1233, 0),
+    5: (1, 1, 1),
+    6: (2, 1, 1),
+    7: (3, 1233, 1),
+    8: (4, 1233, 1),
+}
+
+TABLES = {
+    "t_unit": [{"unit_id": 1, "value": "MW", "lang_id": 1}],
+    "t_band": [{"band_id": 1}],
+    "t_category": [
+        {"category_id": 1, "class_id": 1, "rank": 1, "name": "-"},
+        {"category_id": 2, "class_id": 2, "rank": 1, "name": "Thermal"},
+        {"category_id": 3, "class_id": 2, "rank": 2, "name": "Hydro"},
+        {"category_id": 4, "class_id": 22, "rank": 1, "name": "SEN"},
+    ],
+    "t_class": [
+        {"class_id": 1, "name": "System", "class_group_id": 1, "lang_id": 1},
+        {"class_id": 2, "name": "Generator", "class_group_id": 2, "lang_id": 1},
+        {"class_id": 22, "name": "Node", "class_group_id": 3, "lang_id": 1},
+    ],
+    "t_class_group": [
+        {"class_group_id": 1, "name": "-", "lang_id": 1},
+        {"class_group_id": 2, "name": "Electric", "lang_id": 1},
+        {"class_group_id": 3, "name": "Transmission", "lang_id": 1},
+    ],
+    "t_collection": [
+        {
+            "collection_id": 1,
+            "parent_class_id": 1,
+            "child_class_id": 2,
+            "name": "Generators",
+            "complement_name": "System",
+            "lang_id": 1,
+        },
+        {
+            "collection_id": 245,
+            "parent_class_id": 1,
+            "child_class_id": 22,
+            "name": "Nodes",
+            "complement_name": "System",
+            "lang_id": 1,
+        },
+    ],
+    "t_config": [{"element": "Version", "value": "9.2"}],
+    "t_key": [
+        {
+            "key_id": key_id,
+            "membership_id": membership_id,
+            "model_id": 1,
+            "phase_id": 3,
+            "property_id": property_id,
+            "period_type_id": period_type_id,
+            "band_id": 1,
+            "sample_id": 1,
+            "timeslice_id": 0,
+        }
+        for key_id, (membership_id, property_id, period_type_id) in KEYS.items()
+    ],
+    "t_membership": [
+        {
+            "membership_id": membership_id,
+            "parent_class_id": 1,
+            "child_class_id": child_class_id,
+            "collection_id": collection_id,
+            "parent_object_id": 1,
+            "child_object_id": child_object_id,
+        }
+        for membership_id, child_class_id, collection_id, child_object_id in [
+            (1, 2, 1, 2),
+            (2, 2, 1, 3),
+            (3, 22, 245, 4),
+            (4, 22, 245, 5),
+        ]
+    ],
+    "t_model": [{"model_id": 1, "name": "PCP"}],
+    "t_object": [
+        {
+            "class_id": class_id,
+            "name": name,
+            "category_id": category_id,
+            "index": index,
+            "object_id": object_id,
+            "show": "true",
+        }
+        for object_id, class_id, name, category_id, index in [
+            (1, 1, "System", 1, 1),
+            (2, 2, "G1", 2, 1),
+            (3, 2, "G2", 3, 2),
+            (4, 22, "N1", 4, 1),
+            (5, 22, "N2", 4, 2),
+        ]
+    ],
+    "t_period_0": [
+        {
+            "interval_id": hour + 1,
+            "hour_id": hour + 1,
+            "day_id": hour // 24 + 1,
+            "week_id": 1,
+            "month_id": 1,
+            "quarter_id": 1,
+            "fiscal_year_id": 1,
+            "datetime": (dt.datetime(2024, 1, 1) + dt.timedelta(hours=hour)).strftime(
+                r"%d/%m/%Y %H:%M:%S"
+            ),
+            "period_of_day": hour % 24 + 1,
+        }
+        for hour in range(HOURS)
+    ],
+    "t_period_1": [
+        {
+            "day_id": day + 1,
+            "date": (dt.datetime(2024, 1, 1) + dt.timedelta(days=day)).strftime(
+                r"%Y-%m-%dT%H:%M:%S"
+            ),
+            "week_id": 1,
+            "month_id": 1,
+            "quarter_id": 1,
+            "fiscal_year_id": 1,
+        }
+        for day in range(DAYS)
+    ],
+    "t_phase_3": [
+        {"interval_id": hour + 1, "period_id": hour + 1} for hour in range(HOURS)
+    ],
+    "t_sample": [{"sample_id": 1, "sample_name": "Mean"}],
+    "t_timeslice": [{"timeslice_id": 0, "name": "-"}],
+    "t_property": [
+        {
+            "property_id": property_id,
+            "collection_id": collection_id,
+            "enum_id": property_id,
+            "name": name,
+            "summary_name": name,
+            "unit_id": 1,
+            "summary_unit_id": 1,
+            "is_multi_band": "false",
+            "is_period": "true",
+            "is_summary": "true",
+            "lang_id": 1,
+        }
+        for property_id, collection_id, name in [
+            (1, 1, "Generation"),
+            (1233, 245, "Price"),
+        ]
+    ],
+    "t_attribute_data": [{"object_id": 1, "attribute_id": 1, "value": 0.5}],
+    "t_attribute": [
+        {
+            "attribute_id": 1,
+            "class_id": 1,
+            "enum_id": 1,
+            "name": "Latitude",
+            "description": "Latitude",
+            "lang_id": 1,
+        }
+    ],
+    "t_sample_weight": [{"sample_id": 1, "phase_id": 3, "value": 1}],
+}
+
+
+def expected_value(key_id: int, period_id: int) -> float:
+    return key_id * 1000 + period_id + 0.25
+
+
+def build_key_index() -> tuple[list[dict], dict[int, bytes]]:
+    """Key index rows and the binary payload of every t_data_N.BIN file."""
+    key_index: list[dict] = []
+    binary_data: dict[int, bytes] = {}
+    lengths = {0: HOURS, 1: DAYS}
+    for key_id, (_, _, period_type_id) in KEYS.items():
+        length = lengths[period_type_id]
+        payload = binary_data.get(period_type_id, b"")
+        key_index.append(
+            {
+                "key_id": key_id,
+                "period_type_id": period_type_id,
+                "position": len(payload),
+                "length": length,
+                "period_offset": 0,
+            }
+        )
+        values = [expected_value(key_id, period + 1) for period in range(length)]
+        binary_data[period_type_id] = payload + struct.pack(f"<{length}d", *values)
+    return key_index, binary_data
+
+
+def build_xml(tables: dict[str, list[dict]]) -> str:
+    rows = []
+    for table_name, table_rows in tables.items():
+        for row in table_rows:
+            fields = "".join(f"<{key}>{value}</{key}>" for key, value in row.items())
+            rows.append(f"  <{table_name}>{fields}</{table_name}>")
+    return (
+        '<?xml version="1.0" standalone="yes"?>\n'
+        '<SolutionDataset xmlns="http://tempuri.org/SolutionDataset.xsd">\n'
+        + "\n".join(rows)
+        + "\n</SolutionDataset>\n"
+    )
+
+
+def build_solution_zip(path: Path, compression: int = ZIP_DEFLATED) -> Path:
+    key_index, binary_data = build_key_index()
+    with ZipFile(path, "w", compression=compression) as zip_ref:
+        zip_ref.writestr("Model PCP Solution.xml", build_xml(TABLES | {"t_key_index": key_index}))
+        for period_type_id, payload in binary_data.items():
+            zip_ref.writestr(f"t_data_{period_type_id}.BIN", payload)
+    return path
+
+
+@pytest.fixture
+def solution_zip(tmp_path: Path) -> Path:
+    return build_solution_zip(tmp_path / "solution.zip")
+
+
+@pytest.fixture
+def stored_solution_zip(tmp_path: Path) -> Path:
+    return build_solution_zip(tmp_path / "stored.zip", compression=ZIP_STORED)
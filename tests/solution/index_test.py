@@ -0,0 +1,153 @@
+import datetime as dt
+from zipfile import ZipFile
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.index import KeyEntry, KeyIndex, get_matrix
+from pyplexos.solution.schema import QuerySchema
+
+from conftest import HOURS, expected_value
+
+
+def test_key_index(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    index = KeyIndex.from_key_index(solution.t_key_index)
+
+    assert index[1] == KeyEntry(
+        period_type_id=0, row_start=0, length=HOURS, period_offset=0, position=0
+    )
+    assert index[4] == KeyEntry(0, 3 * HOURS, HOURS, 0, 3 * HOURS * 8)
+    assert index[6] == KeyEntry(1, 2, 2, 0, 16)
+    assert index.slice(solution.t_data_0, 3).column("key_id").unique().to_pylist() == [3]
+
+
+def test_key_index_take(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    index = solution.key_index
+
+    rows = index.take(solution.t_data_0, [4, 2, 1, 99])
+    # keys 1 and 2 are stored back to back and read as one slice
+    assert rows.column("key_id").num_chunks == 2
+    assert rows.column("key_id").unique().to_pylist() == [1, 2, 4]
+    assert rows.num_rows == 3 * HOURS
+    assert index.take(solution.t_data_0, []).num_rows == 0
+
+    with pytest.raises(ValueError):
+        index.take(solution.t_data_0.slice(HOURS), [1])
+
+
+def test_key_index_take_periods(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    index = solution.key_index
+
+    # TEST: solo se leen los períodos 5 a 10 de cada llave
+    rows = index.take(solution.t_data_0, [1, 3], periods=(5, 10))
+    assert rows.column("key_id").num_chunks == 2
+    assert rows.column("period_id").to_pylist() == list(range(5, 11)) * 2
+    assert rows.column("value").to_pylist() == [
+        expected_value(key_id, period_id)
+        for key_id in (1, 3)
+        for period_id in range(5, 11)
+    ]
+    assert index.take(solution.t_data_0, [1], periods=(HOURS + 1, HOURS + 5)).num_rows == 0
+
+
+def test_key_index_read(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    with ZipFile(solution_zip) as zip_ref:
+        binary_data = zip_ref.read("t_data_0.BIN")
+
+    values = solution.key_index.read(binary_data, 3)
+    assert values.tolist() == [expected_value(3, period) for period in range(1, HOURS + 1)]
+    with pytest.raises(ValueError):
+        solution.key_index.read(binary_data[: HOURS * 8], 3)
+
+
+def test_series(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    series = solution.series(3)
+    assert series.column("value").to_pylist() == [
+        expected_value(3, period) for period in range(1, HOURS + 1)
+    ]
+    assert series.column("datetime")[25].as_py() == dt.datetime(2024, 1, 2, 1)
+
+    assert solution.series("N1", QuerySchema.NODE.PRICE).equals(series)
+    daily = solution.series("G2", "Generation", period_type_id=1)
+    assert daily.to_pydict() == {
+        "datetime": [dt.date(2024, 1, 1), dt.date(2024, 1, 2)],
+        "value": [expected_value(6, 1), expected_value(6, 2)],
+    }
+
+    with pytest.raises(ValueError):
+        solution.series("N1")
+
+
+def test_series_filtered_solution(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip), objects=["N2"])
+
+    assert solution.series(4).column("value")[0].as_py() == expected_value(4, 1)
+    with pytest.raises(KeyError):
+        solution.series(3)
+
+
+def test_matrix(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    matrix = solution.matrix(QuerySchema.NODE.PRICE)
+    assert matrix.objects == ["N1", "N2"]
+    assert matrix.values.shape == (2, HOURS)
+    assert matrix.values[1, 5] == expected_value(4, 6)
+    assert matrix.datetimes[0] == np.datetime64("2024-01-01T00:00")
+    # TEST: sin copia, la matriz es una vista de t_data_0
+    assert not matrix.values.flags.owndata
+
+    daily = solution.matrix(QuerySchema.GENERATOR.GENERATION, period_type_id=1)
+    assert daily.values.tolist() == [
+        [expected_value(5, 1), expected_value(5, 2)],
+        [expected_value(6, 1), expected_value(6, 2)],
+    ]
+
+    # TEST: solo se leen los objetos y períodos pedidos, sin copia
+    window = solution.matrix(QuerySchema.NODE.PRICE, objects=["N2"], periods=(5, 10))
+    assert window.objects == ["N2"]
+    assert window.values.tolist() == [
+        [expected_value(4, period) for period in range(5, 11)]
+    ]
+    assert window.datetimes[0] == np.datetime64("2024-01-01T04:00")
+    assert not window.values.flags.owndata
+
+    # TEST: t_data_0 fuera del orden de t_key_index no se lee por posición
+    solution.t_data_0 = solution.t_data_0.sort_by(
+        [("period_id", "ascending"), ("key_id", "ascending")]
+    )
+    with pytest.raises(ValueError):
+        solution.matrix(QuerySchema.NODE.PRICE)
+
+
+def test_get_matrix_with_ragged_runs():
+    t_data = pa.table(
+        {
+            "key_id": [1, 1, 1, 2, 2],
+            "period_id": [1, 2, 3, 3, 4],
+            "value": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+    entries = [KeyEntry(0, 3, 2, 2, 24), KeyEntry(0, 0, 3, 0, 0)]
+    values, period_ids = get_matrix(t_data, entries, [2, 1])
+
+    assert period_ids.tolist() == [1, 2, 3, 4]
+    np.testing.assert_array_equal(
+        values, [[np.nan, np.nan, 4.0, 5.0], [1.0, 2.0, 3.0, np.nan]]
+    )
+
+
+    values, period_ids = get_matrix(t_data, entries, [2, 1], periods=(2, 3))
+    assert period_ids.tolist() == [2, 3]
+    np.testing.assert_array_equal(values, [[np.nan, 4.0], [2.0, 3.0]])
+
+    with pytest.raises(ValueError):
+        get_matrix(t_data, entries, [1, 2])
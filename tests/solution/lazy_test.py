@@ -0,0 +1,70 @@
+import pyarrow.parquet as pq
+import pytest
+
+from pyplexos.solution import QUERY_TABLES, PlexosSolution
+from pyplexos.solution.lazy import LazyPlexosSolution, ZipSource
+from pyplexos.solution.schema import QuerySchema
+
+
+def test_lazy_solution_reads_tables_on_demand(solution_zip):
+    expected = PlexosSolution.from_zip(str(solution_zip))
+    solution = LazyPlexosSolution.from_zip(str(solution_zip))
+    assert "loaded=[]" in repr(solution)
+
+    # TEST: los precios solo leen las tablas de la consulta
+    assert solution.cmg.equals(expected.cmg)
+    loaded = {name for name in solution.__dict__ if name.startswith("t_")}
+    assert loaded == {*QUERY_TABLES, "t_data_0"}
+
+    # t_data_1 is decoded with the key index already read
+    assert solution.t_data_1.equals(expected.t_data_1)
+    assert "t_memo_object" not in solution.__dict__
+
+
+def test_lazy_solution_items(solution_zip, tmp_path):
+    expected = PlexosSolution.from_zip(str(solution_zip))
+    solution = LazyPlexosSolution.from_zip(str(solution_zip))
+
+    for table_name, table in solution.items():
+        assert table.equals(expected[table_name]), table_name
+
+    LazyPlexosSolution.from_zip(str(solution_zip)).to_parquet(str(tmp_path))
+    assert pq.read_table(tmp_path / "t_data_1.parquet").equals(expected.t_data_1)
+
+
+def test_lazy_solution_series(solution_zip):
+    expected = PlexosSolution.from_zip(str(solution_zip))
+    solution = LazyPlexosSolution.from_zip(str(solution_zip)).materialize("t_object")
+    assert list(solution.__dict__) == ["source", "query_cache", "t_object"]
+
+    assert solution.series("N1", property="Price").equals(
+        expected.series("N1", property="Price")
+    )
+    # TEST: la serie se lee del BIN sin decodificar t_data_0
+    assert "t_data_0" not in solution.__dict__
+    assert solution.matrix(QuerySchema.NODE.PRICE).objects == ["N1", "N2"]
+
+
+@pytest.mark.parametrize(
+    "attribute",
+    [
+        "dim_key",
+        "dim_period",
+        "key_index",
+        "data_aligned",
+        "period_datetimes",
+        "duckdb_engine",
+    ],
+)
+def test_lazy_dimensions_read_in_one_pass(solution_zip, monkeypatch, attribute):
+    calls = []
+    read_tables = ZipSource.read_tables
+
+    def counted_read_tables(self, table_names, t_key_index=None):
+        calls.append(set(table_names))
+        return read_tables(self, table_names, t_key_index=t_key_index)
+
+    monkeypatch.setattr(ZipSource, "read_tables", counted_read_tables)
+
+    getattr(LazyPlexosSolution.from_zip(str(solution_zip)), attribute)
+    assert len(calls) == 1
@@ -0,0 +1,39 @@
+from zipfile import ZipFile
+
+import numpy as np
+
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.zip.member import map_zip_member
+
+
+def test_map_stored_member(stored_solution_zip):
+    with ZipFile(stored_solution_zip) as zip_ref:
+        data = zip_ref.read("t_data_0.BIN")
+        mapped = map_zip_member(zip_ref, "t_data_0.BIN")
+
+    assert mapped.readonly
+    assert mapped.tobytes() == data
+
+
+def test_map_compressed_member_is_extracted_once(solution_zip, tmp_path):
+    extract_dir = tmp_path / "cache"
+    with ZipFile(solution_zip) as zip_ref:
+        data = zip_ref.read("t_data_0.BIN")
+        mapped = map_zip_member(zip_ref, "t_data_0.BIN", extract_dir)
+        (extracted,) = extract_dir.iterdir()
+        modified = extracted.stat().st_mtime_ns
+        remapped = map_zip_member(zip_ref, "t_data_0.BIN", extract_dir)
+
+    assert mapped.tobytes() == remapped.tobytes() == data
+    assert extracted.stat().st_mtime_ns == modified
+
+
+def test_from_zip_memory_map(solution_zip, stored_solution_zip, tmp_path):
+    expected = PlexosSolution.from_zip(str(solution_zip)).t_data_0
+
+    for path in (solution_zip, stored_solution_zip):
+        solution = PlexosSolution.from_zip(
+            str(path), memory_map=True, extract_dir=str(tmp_path / "cache")
+        )
+        assert solution.t_data_0.equals(expected)
+        assert not np.asarray(solution.t_data_0.column("value").chunk(0)).flags.writeable
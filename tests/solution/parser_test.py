@@ -0,0 +1,159 @@
+import datetime as dt
+from io import BytesIO
+from zipfile import ZipFile
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+from pydantic import ValidationError
+
+import pyplexos.utils.xml
+from conftest import TABLES, build_xml
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.zip import KEY_TABLES, read_solution_xml, resolve_tables
+from pyplexos.solution.zip.xml import DATETIME_FORMATS, SOLUTION_SCHEMAS, SolutionModel
+from pyplexos.utils.xml import parse_datetimes, read_xml_tables
+
+
+def read_xml(solution_zip, validate: bool) -> dict[str, pa.Table]:
+    with ZipFile(solution_zip) as zip_ref, zip_ref.open("Model PCP Solution.xml") as xml_file:
+        return read_solution_xml(xml_file, validate=validate)
+
+
+def test_read_solution_xml_matches_validated_model(solution_zip):
+    tables = read_xml(solution_zip, validate=False)
+    validated = read_xml(solution_zip, validate=True)
+
+    assert tables.keys() == validated.keys() == SOLUTION_SCHEMAS.keys()
+    for table_name, table in tables.items():
+        assert table.schema.equals(SOLUTION_SCHEMAS[table_name])
+        assert table.equals(validated[table_name]), table_name
+
+    # TEST: tablas ausentes del xml quedan vacías con su esquema
+    assert tables["t_period_2"].num_rows == 0
+    assert tables["t_period_2"].schema.names == ["week_id", "week_ending"]
+    assert tables["t_period_0"].column("datetime")[1].as_py() == dt.datetime(2024, 1, 1, 1)
+
+
+def test_read_xml_tables_skips_unknown_elements_and_batches(monkeypatch):
+    monkeypatch.setattr(pyplexos.utils.xml, "BATCH_ROWS", 2)
+    xml = build_xml(
+        {
+            "t_object": TABLES["t_object"],
+            "t_unknown": [{"value": "x"}],
+            "t_class": [{"class_id": " 7 ", "name": "", "extra": "1"}] * 3,
+        }
+    )
+    schemas = {
+        "t_class": SOLUTION_SCHEMAS["t_class"],
+        "t_band": SOLUTION_SCHEMAS["t_band"],
+    }
+
+    tables = read_xml_tables(BytesIO(xml.encode()), schemas)
+
+    assert tables.keys() == schemas.keys()
+    assert tables["t_class"].column("class_id").num_chunks == 2
+    assert tables["t_class"].column("class_id").to_pylist() == [7, 7, 7]
+    assert tables["t_class"].column("name").to_pylist() == [None, None, None]
+    assert tables["t_band"].num_rows == 0
+
+
+def test_from_zip_validate(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    validated = PlexosSolution.from_zip(str(solution_zip), validate=True)
+
+    assert solution.t_key.equals(validated.t_key)
+    assert solution.t_data_0.equals(validated.t_data_0)
+
+
+def test_read_solution_xml_selected_tables(solution_zip):
+    with ZipFile(solution_zip) as zip_ref, zip_ref.open("Model PCP Solution.xml") as xml_file:
+        tables = read_solution_xml(xml_file, tables=["t_object", "t_period_1"])
+
+    assert tables.keys() == SOLUTION_SCHEMAS.keys()
+    assert tables["t_object"].num_rows == len(TABLES["t_object"])
+    assert tables["t_period_1"].num_rows == len(TABLES["t_period_1"])
+    assert tables["t_key"].num_rows == 0
+    assert tables["t_key"].schema.equals(SOLUTION_SCHEMAS["t_key"])
+
+
+def test_resolve_tables():
+    assert resolve_tables(["t_object"]) == {"t_object"}
+    assert resolve_tables(["t_data_1"]) == {"t_data_1", "t_key_index"}
+    assert resolve_tables(["t_data_0"], filtered=True) == {
+        "t_data_0",
+        "t_key_index",
+        *KEY_TABLES,
+    }
+    with pytest.raises(ValueError):
+        resolve_tables(["t_data_5"])
+
+
+def test_from_zip_tables(solution_zip):
+    expected = PlexosSolution.from_zip(str(solution_zip))
+    solution = PlexosSolution.from_zip(
+        str(solution_zip), tables=["t_data_1"], properties=["Generation"]
+    )
+
+    # TEST: t_key_index y las tablas de llaves se agregan solas
+    assert solution.t_key.equals(expected.t_key)
+    assert solution.t_key_index.column("key_id").to_pylist() == [1, 2, 5, 6]
+    assert solution.t_data_1.equals(
+        expected.t_data_1.filter(pc.is_in(expected.t_data_1["key_id"], pa.array([5, 6])))
+    )
+    assert solution.t_data_0.num_rows == 0
+    assert solution.t_period_0.num_rows == 0
+
+
+def test_parse_datetimes_accepts_both_formats():
+    text = pa.array(["31/01/2024 13:00:00", "2024-02-01T00:30:00", None])
+
+    timestamps = parse_datetimes(text, DATETIME_FORMATS["t_period_0"])
+
+    assert timestamps.to_pylist() == [
+        dt.datetime(2024, 1, 31, 13),
+        dt.datetime(2024, 2, 1, 0, 30),
+        None,
+    ]
+    with pytest.raises(ValueError):
+        parse_datetimes(pa.array(["2024/01/31"]), DATETIME_FORMATS["t_period_1"])
+
+
+def test_from_zip_table_types(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    assert solution.t_key.schema.field("key_id").type == pa.int32()
+    assert solution.t_key.schema.field("period_type_id").type == pa.int8()
+    assert solution.t_key_index.schema.field("position").type == pa.int64()
+    assert pa.types.is_dictionary(solution.t_object.schema.field("name").type)
+    assert solution.t_data_0.schema.field("key_id").type == pa.int32()
+    # TEST: tablas opcionales ausentes mantienen su esquema
+    assert solution.t_custom_column.schema.equals(SOLUTION_SCHEMAS["t_custom_column"])
+
+
+def test_solution_model_without_validation(solution_zip):
+    with ZipFile(solution_zip) as zip_ref:
+        validated = SolutionModel.from_xml(zip_ref.open("Model PCP Solution.xml"))
+        constructed = SolutionModel.from_xml(
+            zip_ref.open("Model PCP Solution.xml"), validate=False
+        )
+
+    for table_name, rows in validated:
+        assert getattr(constructed, table_name) == (rows or []), table_name
+
+
+def test_sampled_validation_catches_format_changes():
+    rows = [dict(row) for _ in range(4) for row in TABLES["t_key"]]
+    del rows[30]["membership_id"]
+    xml = build_xml({"t_key": rows}).encode()
+
+    # TEST: sin validación la columna queda con nulos
+    tables = SolutionModel.tables_from_xml(BytesIO(xml), tables=["t_key"])
+    assert tables["t_key"].column("membership_id").null_count == 1
+
+    # one row in four is validated, row 30 is not sampled
+    SolutionModel.tables_from_xml(BytesIO(xml), tables=["t_key"], validate=0.25)
+    with pytest.raises(ValidationError):
+        SolutionModel.tables_from_xml(BytesIO(xml), tables=["t_key"], validate=0.5)
+    with pytest.raises(ValueError):
+        SolutionModel.tables_from_xml(BytesIO(xml), validate=2.0)
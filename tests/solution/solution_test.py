@@ -0,0 +1,247 @@
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+import polars as pl
+import pyarrow.parquet as pq
+import pytest
+
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.schema import QuerySchema
+
+from conftest import HOURS, expected_value
+
+
+def test_from_zip(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    assert solution.t_data_0.num_rows == 4 * HOURS
+    assert solution.t_data_0.column("value").to_pylist()[:2] == [
+        expected_value(1, 1),
+        expected_value(1, 2),
+    ]
+
+    cmg = solution.query(QuerySchema.NODE.PRICE)
+    assert cmg.height == 2 * HOURS
+    assert set(cmg["child_name"]) == {"N1", "N2"}
+    assert cmg.filter(child_name="N2")["value"].to_list() == [
+        expected_value(4, period) for period in range(1, HOURS + 1)
+    ]
+
+
+def test_from_zip_decodes_every_period_type(solution_zip, tmp_path):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    assert solution.t_data_1.to_pydict() == {
+        "key_id": [5, 5, 6, 6, 7, 7, 8, 8],
+        "period_id": [1, 2] * 4,
+        "value": [expected_value(key, day) for key in (5, 6, 7, 8) for day in (1, 2)],
+    }
+    assert solution.t_data_2.num_rows == 0
+
+    solution.to_parquet(str(tmp_path))
+    assert pq.read_table(tmp_path / "t_data_1.parquet").equals(solution.t_data_1)
+
+    solution.to_duck(str(tmp_path))
+    with duckdb.connect((tmp_path / "raw.duck").as_posix()) as conn:
+        assert conn.sql("select count(*) from t_data_1").fetchone() == (8,)
+
+
+def test_from_zip_filters_keys(solution_zip):
+    solution = PlexosSolution.from_zip(
+        str(solution_zip),
+        properties=[QuerySchema.NODE.PRICE, QuerySchema.GENERATOR.GENERATION],
+        objects=["G1", "N2"],
+    )
+
+    assert solution.t_key_index.column("key_id").to_pylist() == [1, 4, 5, 8]
+    assert solution.t_data_0.column("key_id").unique().to_pylist() == [1, 4]
+    assert solution.t_data_1.column("key_id").unique().to_pylist() == [5, 8]
+    assert solution.query(QuerySchema.NODE.PRICE)["child_name"].unique().to_list() == ["N2"]
+
+    solution = PlexosSolution.from_zip(str(solution_zip), collections=["Generators"])
+    assert solution.t_data_0.column("key_id").unique().to_pylist() == [1, 2]
+    assert solution.query(QuerySchema.NODE.PRICE).is_empty()
+
+
+def test_dim_key_is_built_once(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    dim_key = solution.dim_key
+    assert dim_key.height == solution.t_key.num_rows
+    assert dim_key.filter(key_id=3).select("collection_name", "child_name").row(0) == (
+        "Nodes",
+        "N1",
+    )
+
+    gen = solution.gen
+    assert solution.dim_key is dim_key
+    assert gen.height == 2 * HOURS
+    assert gen.columns == solution.cmg.columns
+    assert solution.find_keys(objects=["G2"])["key_id"].to_list() == [2, 6]
+
+
+def test_frames_are_converted_once(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    t_object = solution.frame("t_object")
+    assert solution.frame("t_object") is t_object
+    assert t_object.collect()["name"].to_list() == solution.t_object["name"].to_pylist()
+
+    # TEST: las consultas reutilizan las vistas ya convertidas
+    solution.cmg
+    assert solution.frames["t_object"] is t_object
+    assert set(solution.frames) == {
+        "t_key",
+        "t_membership",
+        "t_collection",
+        "t_object",
+        "t_property",
+        "t_category",
+        "t_phase_3",
+        "t_period_0",
+    }
+
+
+def test_query_many(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    properties = [QuerySchema.NODE.PRICE, QuerySchema.GENERATOR.GENERATION]
+
+    frames = solution.query_many(properties)
+    assert list(frames) == properties
+    for query_enum, frame in frames.items():
+        expected = solution.query(query_enum)
+        assert frame.sort("child_name", "datetime").equals(
+            expected.sort("child_name", "datetime")
+        )
+
+    long = solution.query_many(properties, long=True)
+    assert long.height == 4 * HOURS
+    assert long.columns == solution.cmg.columns
+    assert long.group_by("property_name").len().sort("property_name").rows() == [
+        ("Generation", 2 * HOURS),
+        ("Price", 2 * HOURS),
+    ]
+    assert solution.query_many([QuerySchema.LINE.FLOW])[QuerySchema.LINE.FLOW].is_empty()
+
+
+def test_query_wide(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    wide = solution.query(QuerySchema.NODE.PRICE, layout="wide")
+    assert wide.columns == ["datetime", "N1", "N2"]
+    assert wide.height == HOURS
+    assert wide.equals(
+        solution.cmg.pivot(on="child_name", index="datetime", values="value")
+        .with_columns(pl.col("N1", "N2").cast(pl.Float64))
+        .sort("datetime")
+    )
+    with pytest.raises(ValueError):
+        solution.query(QuerySchema.NODE.PRICE, layout="tall")
+
+
+def test_query_duckdb_engine(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    for query_enum in (QuerySchema.NODE.PRICE, QuerySchema.GENERATOR.GENERATION):
+        expected = solution.query(query_enum)
+        data = solution.query(query_enum, engine="duckdb")
+        assert data.schema == expected.schema
+        # categorical columns are compared as text, their encodings differ
+        assert data.with_columns(pl.col(pl.Categorical).cast(pl.String)).sort(
+            "child_name", "datetime"
+        ).equals(
+            expected.with_columns(pl.col(pl.Categorical).cast(pl.String)).sort(
+                "child_name", "datetime"
+            )
+        )
+
+    assert solution.query(QuerySchema.LINE.FLOW, engine="duckdb").height == 0
+    with pytest.raises(ValueError):
+        solution.query(QuerySchema.NODE.PRICE, engine="pandas")
+
+
+def test_query_ids_only(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+
+    ids = solution.query(QuerySchema.NODE.PRICE, ids_only=True)
+    assert ids.columns == ["key_id", "period_id", "value"]
+    assert ids.height == 2 * HOURS
+
+    # TEST: unir las dimensiones reproduce la consulta con nombres
+    joined = (
+        ids.join(solution.dim_key, on="key_id")
+        .join(solution.dim_period, on="period_id")
+        .select(solution.cmg.columns)
+    )
+    assert joined.equals(solution.cmg)
+    assert solution.cmg.schema["child_name"] == pl.Categorical
+    with pytest.raises(ValueError):
+        solution.query(QuerySchema.NODE.PRICE, layout="wide", ids_only=True)
+
+
+def test_query_filters(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    start, end = dt.datetime(2024, 1, 1, 6), dt.datetime(2024, 1, 2)
+
+    data = solution.query(QuerySchema.NODE.PRICE, start=start, end=end, objects=["N2"])
+    assert data.height == 18
+    assert data["child_name"].unique().to_list() == ["N2"]
+    assert (data["datetime"].min(), data["datetime"].max()) == (
+        start,
+        dt.datetime(2024, 1, 1, 23),
+    )
+    assert solution.period_range(start, end) == (7, 24)
+
+    # TEST: ambos motores y el formato de ids devuelven las mismas filas
+    duck = solution.query(
+        QuerySchema.NODE.PRICE, engine="duckdb", start=start, end=end, objects=["N2"]
+    )
+    assert duck.sort("datetime")["value"].equals(data["value"])
+    ids = solution.query(QuerySchema.NODE.PRICE, ids_only=True, start=start, end=end)
+    assert ids.height == 2 * 18
+
+    gen = solution.query(QuerySchema.GENERATOR.GENERATION, categories=["Hydro"])
+    assert gen["child_name"].unique().to_list() == ["G2"]
+    wide = solution.query(
+        QuerySchema.GENERATOR.GENERATION, layout="wide", categories=["Hydro"], end=end
+    )
+    assert wide.columns == ["datetime", "G2"]
+    assert wide.height == 24
+
+
+def test_query_reordered_data(solution_zip):
+    expected = PlexosSolution.from_zip(str(solution_zip))
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    # e.g. t_data_0 read from an accdb, in any row order
+    solution.t_data_0 = solution.t_data_0.sort_by(
+        [("period_id", "ascending"), ("key_id", "ascending")]
+    )
+
+    assert not solution.data_aligned
+    for kwargs in ({}, {"start": dt.datetime(2024, 1, 1, 6), "objects": ["N2"]}):
+        data = solution.query(QuerySchema.NODE.PRICE, **kwargs)
+        assert data.sort("child_name", "datetime").equals(
+            expected.query(QuerySchema.NODE.PRICE, **kwargs)
+        )
+    ids = solution.query(QuerySchema.NODE.PRICE, ids_only=True)
+    assert ids.sort("key_id", "period_id").equals(
+        expected.query(QuerySchema.NODE.PRICE, ids_only=True)
+    )
+    for kwargs in ({}, {"end": dt.datetime(2024, 1, 2), "objects": ["N2"]}):
+        wide = solution.query(QuerySchema.NODE.PRICE, layout="wide", **kwargs)
+        assert wide.equals(expected.query(QuerySchema.NODE.PRICE, layout="wide", **kwargs))
+
+
+def test_query_duckdb_engine_threads(solution_zip):
+    solution = PlexosSolution.from_zip(str(solution_zip))
+    expected = solution.duckdb_engine.query([QuerySchema.NODE.PRICE]).height
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        heights = list(
+            executor.map(
+                lambda _: solution.duckdb_engine.query([QuerySchema.NODE.PRICE]).height,
+                range(8),
+            )
+        )
+    assert heights == [expected] * 8
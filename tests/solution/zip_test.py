@@ -0,0 +1,64 @@
+from zipfile import ZipFile
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from conftest import DAYS, TABLES, build_key_index, build_xml, expected_value
+
+from pyplexos.solution import PlexosSolution
+from pyplexos.solution.zip import iter_solution_batches
+
+
+def test_iter_solution_batches(solution_zip):
+    expected = PlexosSolution.from_zip(str(solution_zip))
+
+    batches = list(iter_solution_batches(solution_zip, batch_rows=10))
+    assert all(batch.num_rows <= 10 for batch in batches)
+    assert pa.Table.from_batches(batches).equals(expected.t_data_0)
+
+    batches = list(iter_solution_batches(solution_zip, batch_rows=3, period_type_id=1))
+    assert pa.Table.from_batches(batches).equals(expected.t_data_1)
+
+
+def test_from_zip_streams_to_parquet_and_duckdb(solution_zip, tmp_path):
+    expected = PlexosSolution.from_zip(str(solution_zip))
+
+    PlexosSolution.from_zip(str(solution_zip), batch_rows=7).to_parquet(str(tmp_path))
+    assert pq.read_table(tmp_path / "t_data_0.parquet").equals(expected.t_data_0)
+    assert pq.read_table(tmp_path / "t_data_2.parquet").num_rows == 0
+
+    PlexosSolution.from_zip(str(solution_zip), batch_rows=7).to_duck(str(tmp_path))
+    with duckdb.connect((tmp_path / "raw.duck").as_posix()) as conn:
+        data = conn.sql("select * from t_data_0").arrow()
+    assert data.equals(expected.t_data_0)
+
+
+def test_extract_zip_data_timings(solution_zip):
+    timings: dict[str, float] = {}
+    PlexosSolution.from_zip(str(solution_zip), timings=timings)
+
+    assert {"xml", "read_bin", "decode", "total"} <= timings.keys()
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_extract_zip_data_split_key_index(tmp_path):
+    # TEST: t_key_index en dos bloques, el primer decode queda obsoleto
+    key_index, binary_data = build_key_index()
+    first = build_xml(TABLES | {"t_key_index": key_index[:5]})
+    second = build_xml({"t_band": [{"band_id": 2}], "t_key_index": key_index[5:]})
+    xml = first.replace(
+        "\n</SolutionDataset>\n",
+        "\n" + "\n".join(second.splitlines()[2:]) + "\n",
+    )
+    path = tmp_path / "split.zip"
+    with ZipFile(path, "w") as zip_ref:
+        zip_ref.writestr("Model PCP Solution.xml", xml)
+        for period_type_id, payload in binary_data.items():
+            zip_ref.writestr(f"t_data_{period_type_id}.BIN", payload)
+
+    solution = PlexosSolution.from_zip(str(path))
+
+    assert solution.t_key_index.num_rows == len(key_index)
+    assert solution.t_data_1.num_rows == 4 * DAYS
+    assert solution.t_data_1.column("value").to_pylist()[-1] == expected_value(8, DAYS)